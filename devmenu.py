@@ -1,7 +1,28 @@
-from collections import deque
+from collections import deque, defaultdict, OrderedDict
+from concurrent.futures import (
+    Executor, Future, ThreadPoolExecutor, wait, FIRST_COMPLETED)
 from pathlib import Path
-from typing import Tuple, Dict, List, Any, Optional, Callable, Union
+from typing import Tuple, Dict, List, Any, Optional, Callable, Union, Iterable
 
+import asyncio
+import bisect
+import functools
+import hashlib
+import importlib
+import inspect
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
+import queue
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
 import traceback
 
 
@@ -16,9 +37,447 @@ CYAN = "\033[36m"
 CLEAR_SCREEN = "\033[2J"
 CURSOR_HOME = "\033[H"
 
-MenuNode = Tuple[str, Callable[..., Any], Tuple[Any, ...], Dict[Any, Any]]
+# the function may also be given as an import path "pkg.mod:func"
+MenuNode = Tuple[str, Union[Callable[..., Any], str], Tuple[Any, ...],
+                 Dict[Any, Any]]
 ActionDict = Dict[str, MenuNode]
 
+
+class ActionCache:
+    """
+    Result cache of one action, keyed by its call arguments.
+
+    maxsize    - max number of results kept in memory (LRU eviction)
+    ttl        - seconds a result stays valid (None = forever)
+    max_bytes  - cap on the pickled size of results kept in memory
+    disk       - directory for a persistent copy of every result, so that
+                 cached results survive restarts (read back on memory miss)
+
+    Arguments and results must be picklable to be cached (arguments are
+    hashed via pickle); calls with unpicklable arguments are not cached.
+    A failed disk write never fails the call: the result is kept in
+    memory and the error is reported to on_error (DevMenu.log).
+    """
+    def __init__(
+        self,
+        name: str = "",
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        disk: Optional[Union[str, Path]] = None,
+    ):
+        self.prefix = hashlib.sha1(name.encode()).hexdigest()[:8]
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk = Path(disk) if disk else None
+        if self.disk:
+            self.disk.mkdir(parents=True, exist_ok=True)
+        # ckey -> (stored_at, size, value)
+        self.entries: OrderedDict[str, Tuple[float, int, Any]] = OrderedDict()
+        self.size = 0
+        self._lock = threading.Lock()
+        self.on_error: Callable[[str], None] = lambda msg: print(
+            msg, file=sys.stderr)
+
+    def key(self, args: Tuple[Any, ...], kwargs: Dict[Any, Any]) -> Optional[str]:
+        try:
+            blob = pickle.dumps((args, sorted(kwargs.items())))
+        except Exception:
+            return None
+        return hashlib.sha256(blob).hexdigest()
+
+    def _path(self, ckey: str) -> Path:
+        return self.disk / f"{self.prefix}-{ckey[:32]}.pkl"
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def get(self, ckey: str) -> Tuple[bool, Any]:
+        """Returns (hit, value)."""
+        with self._lock:
+            entry = self.entries.get(ckey)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self.entries.move_to_end(ckey)
+                    return True, entry[2]
+                self._drop(ckey)
+        if self.disk:
+            path = self._path(ckey)
+            try:
+                with open(path, "rb") as f:
+                    stored_at, value = pickle.load(f)
+            except FileNotFoundError:
+                return False, None
+            except Exception:
+                # unreadable, or its class was renamed/moved since: a miss
+                path.unlink(missing_ok=True)
+                return False, None
+            if self._expired(stored_at):
+                path.unlink(missing_ok=True)
+                return False, None
+            self._store(ckey, stored_at, value, path.stat().st_size)
+            return True, value
+        return False, None
+
+    def put(self, ckey: str, value: Any) -> None:
+        stored_at = time.time()
+        blob = None
+        if self.max_bytes is not None or self.disk:
+            try:
+                blob = pickle.dumps((stored_at, value))
+            except Exception:
+                pass
+        if self.disk and blob is not None:
+            tmp = self._path(ckey).with_suffix(".tmp")
+            try:
+                tmp.write_bytes(blob)
+                os.replace(tmp, self._path(ckey))
+            except OSError as e:
+                tmp.unlink(missing_ok=True)
+                self.on_error(f"{RED}Cache write failed: {e}{RESET}")
+        size = len(blob) if blob is not None else sys.getsizeof(value)
+        self._store(ckey, stored_at, value, size)
+
+    def _store(self, ckey: str, stored_at: float, value: Any,
+               size: int) -> None:
+        with self._lock:
+            self._drop(ckey)
+            self.entries[ckey] = (stored_at, size, value)
+            self.size += size
+            while self.entries and (
+                    len(self.entries) > self.maxsize
+                    or (self.max_bytes is not None
+                        and self.size > self.max_bytes)):
+                self._drop(next(iter(self.entries)))
+
+    def _drop(self, ckey: str) -> None:
+        entry = self.entries.pop(ckey, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def clear(self) -> None:
+        """Drop every result, including the disk copies."""
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+        if self.disk:
+            for path in self.disk.glob(f"{self.prefix}-*.pkl"):
+                path.unlink(missing_ok=True)
+
+def import_callable(path: str) -> Callable[..., Any]:
+    """Import "pkg.mod:func" (or "pkg.mod.func", "pkg.mod:Class.method")."""
+    module, _, attr = path.partition(":")
+    if not attr:
+        module, _, attr = path.rpartition(".")
+    obj = importlib.import_module(module)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class Screen:
+    """
+    Minimal diff renderer: remembers the last frame (list of lines) drawn
+    from the top of the terminal and rewrites only the lines that changed.
+
+    request() is the throttled variant for frequent updates (log messages
+    from actions and background work): updates arriving within
+    `interval` seconds are merged into one redraw done by a timer thread,
+    with the cursor saved and restored around it.
+    """
+    def __init__(self, interval: float = 0.05, out: Any = None):
+        self.interval = interval
+        self.out = out or sys.stdout
+        self.frame: Optional[List[str]] = None
+        self.paused = False
+        self._build: Optional[Callable[[], List[str]]] = None
+        self._timer: Optional[threading.Timer] = None
+        self._last = 0.0
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        """Forget the last frame (the screen was cleared or overwritten)."""
+        with self._lock:
+            self.frame = None
+
+    def draw(self, lines: List[str], park: bool = True) -> None:
+        """Draw `lines`; park=True leaves the cursor right below the frame
+        (for a prompt), otherwise the cursor position is preserved."""
+        with self._lock:
+            old = self.frame
+            buf = [] if old is not None else [f"{CURSOR_HOME}{CLEAR_SCREEN}"]
+            old = old or []
+            for i, line in enumerate(lines):
+                if i >= len(old) or old[i] != line:
+                    buf.append(f"\033[{i + 1}H{line}\033[K")
+            for i in range(len(lines), len(old)):
+                buf.append(f"\033[{i + 1}H\033[K")
+            self.frame = list(lines)
+            self._last = time.monotonic()
+            if park:
+                buf.append(f"\033[{len(lines) + 1}H\033[J")
+            elif buf:
+                buf = ["\0337", *buf, "\0338"]
+            self.out.write("".join(buf))
+            self.out.flush()
+
+    def request(self, build: Callable[[], List[str]]) -> None:
+        """Throttled draw of the frame returned by `build`."""
+        with self._lock:
+            if self.paused or self.frame is None:
+                return
+            self._build = build
+            if self._timer is not None:
+                return
+            delay = self._last + self.interval - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            build, self._build = self._build, None
+            if build is None or self.paused or self.frame is None:
+                return
+            self.draw(build(), park=False)
+
+
+class ActionStats:
+    """
+    Call counters and latency histogram of one action.
+
+    Durations are measured around the action function itself (for
+    submit(): from the moment the action gets its slot on the executor),
+    cached results count as hits and not as calls.
+    """
+    BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+              1, 2, 5, 10, 30, 60, 300)
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.hits = 0
+        self.total = 0.0
+        self.last: Optional[float] = None
+        self.last_ok: Optional[bool] = None
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.histogram = [0] * (len(self.BOUNDS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, duration: float, ok: bool = True) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += not ok
+            self.total += duration
+            self.last, self.last_ok = duration, ok
+            if self.min is None or duration < self.min:
+                self.min = duration
+            if self.max is None or duration > self.max:
+                self.max = duration
+            self.histogram[bisect.bisect_left(self.BOUNDS, duration)] += 1
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def _quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the histogram bucket holding quantile q."""
+        if not self.calls:
+            return None
+        rank, seen = q * self.calls, 0
+        for bound, count in zip(self.BOUNDS, self.histogram):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={b}" for b in self.BOUNDS] + [f">{self.BOUNDS[-1]}"]
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "cache_hits": self.hits,
+                "last": self.last,
+                "last_ok": self.last_ok,
+                "mean": self.total / self.calls if self.calls else None,
+                "min": self.min,
+                "max": self.max,
+                "p50": self._quantile(0.5),
+                "p95": self._quantile(0.95),
+                "total": self.total,
+                "histogram": dict(zip(labels, self.histogram)),
+            }
+
+    def summary(self) -> str:
+        if not self.calls:
+            return f"{self.hits} cached, not run"
+        return (f"last {self.last:.3f} s, mean {self.total / self.calls:.3f} s,"
+                f" {self.calls} calls, {self.errors} errors, {self.hits} cached")
+
+
+_job_local = threading.local()
+
+
+class _JobStream:
+    """sys.stdout/sys.stderr wrapper sending the writes of job threads
+    to their Job, everything else to the original stream."""
+    def __init__(self, stream: Any, name: str):
+        self._stream = stream
+        self._name = name
+
+    def write(self, text: str) -> int:
+        job = getattr(_job_local, "job", None)
+        if job is None:
+            return self._stream.write(text)
+        job.write(text, self._name)
+        return len(text)
+
+    def flush(self) -> None:
+        if getattr(_job_local, "job", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class _QueueStream(io.TextIOBase):
+    """stdout/stderr of a job process, forwarded to the parent."""
+    def __init__(self, channel: Any, name: str):
+        self._channel = channel
+        self._name = name
+
+    def write(self, text: str) -> int:
+        self._channel.put((self._name, text))
+        return len(text)
+
+
+class _JobProxy:
+    """The `job` argument seen by an action running in a job process."""
+    cancelled = False  # process jobs are cancelled by termination
+
+    def __init__(self, channel: Any):
+        self._channel = channel
+
+    def progress(self, value: Any = None, msg: str = "") -> None:
+        self._channel.put(("progress", value, msg))
+
+
+def _job_process(fnc: Union[Callable[..., Any], str], args: Tuple[Any, ...],
+                 kwargs: Dict[Any, Any], wants_job: bool,
+                 channel: Any) -> None:
+    sys.stdout = _QueueStream(channel, "stdout")
+    sys.stderr = _QueueStream(channel, "stderr")
+    try:
+        if isinstance(fnc, str):
+            fnc = import_callable(fnc)
+        if wants_job:
+            kwargs = {**kwargs, "job": _JobProxy(channel)}
+        channel.put(("result", pickle.dumps(fnc(*args, **kwargs))))
+    except BaseException:
+        channel.put(("error", traceback.format_exc()))
+
+
+def _wants_job(fnc: Callable[..., Any]) -> bool:
+    try:
+        return "job" in inspect.signature(fnc).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class Job:
+    """
+    One background run of an action (see DevMenu.start_job).
+
+    state     - "queued", "running", "done", "failed" or "cancelled"
+    result    - return value of the action (state "done")
+    error     - formatted traceback (state "failed")
+    stdout, stderr - everything the action printed
+    progress_value, progress_msg - last reported progress
+
+    An action that has a parameter named `job` receives its Job and may
+    call job.progress(0.4, "loading") (reported through the menu log) and
+    check job.cancelled to stop early.
+    """
+    def __init__(self, job_id: int, key: str, name: str, mode: str,
+                 log: Callable[[str], None]):
+        self.id = job_id
+        self.key = key
+        self.name = name
+        self.mode = mode
+        self.state = "queued"
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.progress_value: Any = None
+        self.progress_msg = ""
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._out = {"stdout": io.StringIO(), "stderr": io.StringIO()}
+        self._out_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._log = log
+        self._future: Optional[Future] = None
+        self._process: Any = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def stdout(self) -> str:
+        with self._out_lock:
+            return self._out["stdout"].getvalue()
+
+    @property
+    def stderr(self) -> str:
+        with self._out_lock:
+            return self._out["stderr"].getvalue()
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+    def write(self, text: str, stream: str = "stdout") -> None:
+        with self._out_lock:
+            self._out[stream].write(text)
+
+    def progress(self, value: Any = None, msg: str = "") -> None:
+        self.progress_value, self.progress_msg = value, msg
+        self._log(f"{CYAN}[job {self.id}] {self.name}: "
+                  f"{self._progress_text()}{RESET}")
+
+    def _progress_text(self) -> str:
+        value = self.progress_value
+        if isinstance(value, float) and 0 <= value <= 1:
+            text = f"{value:.0%}"
+        else:
+            text = "" if value is None else str(value)
+        return f"{text} {self.progress_msg}".strip()
+
+    def cancel(self) -> None:
+        """Cancel a queued job, ask a running thread job to stop (via
+        job.cancelled) or terminate a running process job."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self.state = "cancelled"
+            self._log(f"{YELLOW}[job {self.id}] {self.name} cancelled.{RESET}")
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+
+    def summary(self) -> str:
+        elapsed = "" if self.elapsed is None else f"{self.elapsed:8.1f} s"
+        return (f"{self.id:3}  {self.state:9} {self.mode:7} {self.name:24} "
+                f"{elapsed:10} {self._progress_text()}")
+
+
 class DevMenu:
     """
     DevMenu — a lightweight, node-style action router for running functions with
@@ -72,9 +531,121 @@ class DevMenu:
        - Does NOT display the menu
        - Does NOT wait for input
        - Does NOT pause after actions
-       - Executes run_action() silently
+       - Executes run_action() silently: no screen clearing, no headers,
+         exceptions propagate to the caller
        - Ideal for programmatic triggers (e.g. visualizer hooks)
 
+    3) Concurrent dispatch
+       -----------------------------------------
+       menu = DevMenu(actions, auto=True, executor=ThreadPoolExecutor(4),
+                      limits={"load": 1})
+       fut = menu.submit("plot")            # concurrent.futures.Future
+       futs = menu.do_many(["load", "plot", "export"])
+
+       - Actions run on the executor (a thread pool is created on first
+         use if none was given; a process pool needs picklable functions)
+       - limits caps how many runs of one action may overlap; extra
+         submissions wait in a per-action queue, not in the pool
+       - Futures carry the action result or its exception
+       - do_many() resolves dependencies (see Pipelines) like do();
+         submit() is the low-level call: dependency results are passed
+         explicitly as its `inputs`
+
+    4) Pipelines
+       -----------------------------------------
+       menu = DevMenu(actions, auto=True,
+                      deps={"clean": ["load"], "plot": ["clean", "stats"]})
+       results = menu.pipeline()            # or pipeline(["plot"])
+
+       - An action receives the results of its dependencies as leading
+         positional arguments, in declared order: plot(clean, stats, *args)
+       - Independent nodes run in parallel on the executor; results are
+         handed downstream as references (no copies with thread pools)
+       - A node is skipped (its last result reused) when its args/kwargs
+         and the versions of its inputs are unchanged; invalidate(key)
+         or pipeline(force=True) makes it run again
+       - do(key) and the interactive menu resolve dependencies the same way
+       - concurrent callers (pipelines in several threads, do_many(),
+         socket requests) share a node run already in flight, so a common
+         dependency runs once
+
+    5) Result caching
+       -----------------------------------------
+       menu = DevMenu(actions, cache={"load": {"ttl": 600, "disk": ".cache"},
+                                      "plot": True})
+
+       - Opt-in per action; results are keyed by the call arguments
+         (including dependency results) and returned instantly on repeat
+         run()/do()/submit() triggers
+       - Options are those of ActionCache: maxsize (LRU), ttl, max_bytes,
+         disk; True means the defaults
+       - invalidate(key) clears cached results too; in the interactive
+         menu "!" clears all caches, "!<key>" the cache of one action
+
+    6) asyncio
+       -----------------------------------------
+       See AsyncDevMenu: coroutine actions are awaited and the menu loop
+       keeps the event loop free while it waits for a key.
+
+    7) Metrics
+       -----------------------------------------
+       Every action run records its duration, errors and cache hits in
+       an ActionStats (latency histogram included):
+
+       menu.metrics()        # {key: {"calls": .., "p95": .., ...}}
+       menu.metrics_json()   # the same as JSON text, for export
+
+       In the interactive menu each "finished" message carries the
+       duration, and "?" writes a summary of every action to the log.
+
+    8) Lazy actions
+       -----------------------------------------
+       actions = {"r": ("Report", "analytics.reports:build", (), {})}
+       menu = DevMenu(actions, background_preload=True)
+
+       - A function given as an import path is imported on first use, so
+         the menu paints without paying for heavy imports
+       - background_preload=True imports the remaining ones in a thread
+         right after the first paint (preload() does it on demand)
+       - import_report() lists the import time per action, slowest first
+         ("?" in the menu shows it too)
+
+    9) Background jobs
+       -----------------------------------------
+       menu = DevMenu(actions, background={"etl": "process", "plot": "thread"})
+       job = menu.start_job("load")         # any action, returns a Job
+
+       - Jobs run on worker threads ("thread") or in their own process
+         ("process", needs a picklable function or an import path) while
+         the menu stays usable; actions listed in `background` always do
+       - process jobs are spawned, not forked: the main script must guard
+         its menu with `if __name__ == "__main__":`
+       - on "q" jobs are cancelled; thread jobs that do not check
+         job.cancelled are waited for (the menu says which)
+       - stdout/stderr of every job are captured in the Job; an action
+         with a `job` parameter can report progress to the log and check
+         job.cancelled
+       - interactive menu: "&<key>" runs any action as a job, "&" opens
+         the job list (output of a job, cancellation)
+
+    10) Socket control channel
+       -----------------------------------------
+       menu = DevMenu(actions, auto=True)
+       menu.serve("/tmp/etl.sock")          # or serve(..., background=True)
+
+       # in another process
+       for res in remote_do("/tmp/etl.sock", ["load", {"key": "plot",
+                                                       "args": [2]}]):
+           print(res["key"], res["ok"], res["run"], res.get("result"))
+
+       - JSON lines over a Unix domain socket: requests may be pipelined
+         or sent as a batch; they go through submit(), so limits, caches
+         and metrics apply, and dependencies are resolved as in do()
+       - one response per request as soon as it finishes, with the result
+         (or error) and its timings
+       - the socket is created with mode 0600; close() or stop_serving()
+         removes it
+
     ----------------------------------------------------------------------
     Example
     ----------------------------------------------------------------------
@@ -98,15 +669,42 @@ class DevMenu:
     ----------------------------------------------------------------------
 
     __init__(actions, title="Dev Menu", message_lines=5,
-             dev_mode=True, auto=False)
+             dev_mode=True, auto=False, executor=None, limits=None,
+             deps=None, cache=None, background_preload=False,
+             background=None, job_workers=4)
         Initializes the menu object.
         If auto=True, the menu behaves as a silent programmable dispatcher.
+        executor/limits configure concurrent dispatch (submit/do_many).
+        deps maps an action key to the keys whose results it consumes.
+        cache maps an action key to True or to ActionCache options.
 
     run()
         Starts the interactive loop (ignored in auto-mode).
 
     do(key)
-        Programmatically execute the action associated with `key`.
+        Programmatically execute the action associated with `key`
+        and return its result.
+
+    submit(key, *inputs, kwargs=None) -> Future
+        Run the action on the executor, honouring its concurrency limit.
+
+    serve(path, background=False) / stop_serving()
+        Accept action requests on a Unix domain socket.
+
+    pipeline(targets=None, force=False) -> Dict[str, Any]
+        Run the dependency DAG of `targets` with maximal parallelism.
+
+    invalidate(key=None)
+        Make `key` (or every action) re-run in the next pipeline()
+        and drop its cached results.
+
+    do_many(keys) -> List[Future]
+        submit() every key with its dependencies resolved; independent
+        actions overlap.
+
+    close(cancel_jobs=False)
+        Stop the socket server, shut down the executor created by the
+        menu itself and the job workers.
 
     run_action(func, args, kwargs)
         Executes the function:
@@ -118,9 +716,27 @@ class DevMenu:
 
     show_menu()
         Renders the menu and the message log (interactive mode only).
+        Only lines changed since the last frame are sent (see Screen).
 
     log(msg)
-        Adds a message to the rolling log and updates the bottom area.
+        Adds a message to the rolling log and updates the bottom area;
+        updates are throttled, bursts of messages merge into one redraw.
+
+    preload(background=False)
+        Import all actions given by import path.
+
+    import_report() -> List[Tuple[str, str, float]]
+        (key, path, seconds) per imported action, slowest first.
+
+    start_job(key, mode=None) -> Job
+        Run the action in the background ("thread" or "process").
+
+    show_jobs()
+        Full-screen job list with output view and cancellation.
+
+    metrics() / metrics_json(indent=None)
+        Per-action call counts, errors, cache hits, durations and latency
+        histogram as a dict / JSON text.
 
     ----------------------------------------------------------------------
     Summary
@@ -133,6 +749,8 @@ class DevMenu:
         ✔ ideal for modular, plug-and-play architectures
 
     """
+    job_menu = True  # "&" entries of the interactive menu
+
     def __init__(
         self,
         actions: ActionDict,
@@ -140,101 +758,1232 @@ class DevMenu:
         message_lines: int = 5,
         dev_mode: bool = True,
         auto: bool = False,
+        executor: Optional[Executor] = None,
+        limits: Optional[Dict[str, int]] = None,
+        deps: Optional[Dict[str, List[str]]] = None,
+        cache: Optional[Dict[str, Union[bool, Dict[str, Any]]]] = None,
+        background_preload: bool = False,
+        background: Optional[Dict[str, str]] = None,
+        job_workers: int = 4,
     ):
         self.actions = actions
         self.title = title
         self.message_lines = message_lines
         self.messages: deque[str] = deque(maxlen=message_lines)
+        self._log_lock = threading.Lock()
+        self.screen = Screen()
         self.dev_mode = dev_mode
         self.auto = auto
+        self.executor = executor
+        self.limits = limits or {}
+        self._own_executor = False
+        self._lock = threading.Lock()
+        self._running: Dict[str, int] = defaultdict(int)
+        self._pending: Dict[str, deque] = defaultdict(deque)
+        self.deps = deps or {}
+        # key -> (signature, result, version) of the last pipeline run
+        self._nodes: Dict[str, Tuple[Tuple, Any, int]] = {}
+        self._dirty: set = set()
+        # key -> Future of the node run in flight, shared by all pipelines
+        self._inflight: Dict[str, Future] = {}
+        self._pipe_lock = threading.Lock()
+        self.stats: Dict[str, ActionStats] = defaultdict(ActionStats)
+        self.background_preload = background_preload
+        self.import_times: Dict[str, float] = {}
+        self._loaded: Dict[str, Tuple[str, Callable[..., Any]]] = {}
+        self._import_lock = threading.Lock()
+        self.background = background or {}
+        self.jobs: Dict[int, Job] = {}
+        self.job_workers = job_workers
+        self._job_executor: Optional[ThreadPoolExecutor] = None
+        self._job_ids = itertools.count(1)
+        self._server: Optional[socketserver.BaseServer] = None
+        self.caches: Dict[str, ActionCache] = {
+            key: ActionCache(key, **(opts if isinstance(opts, dict) else {}))
+            for key, opts in (cache or {}).items() if opts}
+        for action_cache in self.caches.values():
+            action_cache.on_error = self.log
 
-    def show_menu(self) -> None:
-        print(f"{CURSOR_HOME}{CLEAR_SCREEN}", end="")
-        print(f"{BOLD}{YELLOW}=== {self.title} ==={RESET}")
+    def _frame(self) -> List[str]:
+        lines = [f"{BOLD}{YELLOW}=== {self.title} ==={RESET}"]
         for key, (desc, fnc, args, kwargs) in self.actions.items():
-            print(f"{CYAN}{key}) {desc or fnc.__name__}{RESET}")
-        print(f"{CYAN}q) Quit{RESET}")
-        print("\n--- Messages ---")
+            lines.append(f"{CYAN}{key}) {desc or self._name(key)}{RESET}")
+        if self.caches:
+            lines.append(
+                f"{CYAN}!) Clear cached results (!<key> = one action){RESET}")
+        if self.job_menu:
+            lines.append(f"{CYAN}&) Jobs (&<key> = run in background){RESET}")
+        lines.append(f"{CYAN}?) Action metrics{RESET}")
+        lines.append(f"{CYAN}q) Quit{RESET}")
+        lines += ["", "--- Messages ---"]
         # show last message_lines messages
-        for msg in self.messages:
-            print(msg)
-        for _ in range(self.message_lines - len(self.messages)):
-            print()
+        with self._log_lock:
+            messages = list(self.messages)
+        return lines + messages + [""] * (self.message_lines - len(messages))
+
+    def show_menu(self) -> None:
+        self.screen.draw(self._frame())
 
     def log(self, msg: str) -> None:
-        self.messages.append(str(msg))
-        menu_height = len(self.actions) + 5  # title + q + "--- Messages ---"
-        print(f"\033[{menu_height}H", end="")
-        for i, line in enumerate(self.messages):
-            print(f"\033[{menu_height + i}H{line}\033[K", end="")
-        for i in range(len(self.messages), self.message_lines):
-            print(f"\033[{menu_height+ i}H\033[K", end="")
+        with self._log_lock:
+            self.messages.append(str(msg))
+        if self.auto:
+            return
+        self.screen.request(self._frame)
 
     def run_action(
      self,
      fnc: Callable[..., Any],
      args: Tuple[Any, ...] = (),
-     kwargs: Dict[Any, Any] = {}) -> None:
+     kwargs: Dict[Any, Any] = {}) -> Any:
         """Run function in 'full screen', temporarily suspending menu."""
+        if self.auto:
+            return fnc(*args, **kwargs)
+        self.screen.paused = True
+        self.screen.invalidate()
         print(f"{CURSOR_HOME}{CLEAR_SCREEN}", end="")
         print(f"{BOLD}{YELLOW}=== Running {fnc.__name__} ==={RESET}\n")
+        res = None
         try:
-            fnc(*args, **kwargs)
+            res = fnc(*args, **kwargs)
         except Exception as e:
             print(f"{RED}Error in {fnc.__name__}: {e}{RESET}")
             if self.dev_mode:
                 print(traceback.format_exc())
-        if not self.auto:
-            input(f"\n{CYAN}Press Enter to return to menu...{RESET}")
+        input(f"\n{CYAN}Press Enter to return to menu...{RESET}")
+        self.screen.paused = False
+        return res
 
-    def do(self, key: str):
-        """Programmatically execute action by key."""
+    def _action(self, key: str) -> MenuNode:
         action = self.actions.get(key)
         if not action:
             raise KeyError(f"Unknown action '{key}'")
+        desc, fnc, args, kwargs = action
+        if isinstance(fnc, str):
+            return desc, self._load(key, fnc), args, kwargs
+        return action
+
+    def _load(self, key: str, path: str) -> Callable[..., Any]:
+        loaded = self._loaded.get(key)
+        if loaded is None or loaded[0] != path:
+            with self._import_lock:
+                loaded = self._loaded.get(key)
+                if loaded is None or loaded[0] != path:
+                    startt = time.perf_counter()
+                    loaded = path, import_callable(path)
+                    seconds = time.perf_counter() - startt
+                    # _loaded first: import_report() reads without the lock
+                    self._loaded[key] = loaded
+                    self.import_times[key] = seconds
+        return loaded[1]
+
+    def _name(self, key: str) -> str:
+        """Display name of an action without importing it."""
+        fnc = self.actions[key][1]
+        if isinstance(fnc, str):
+            return fnc.replace(":", ".").rpartition(".")[2]
+        return fnc.__name__
+
+    def preload(self, background: bool = False) -> Optional[threading.Thread]:
+        """Import every action given by import path (in a daemon thread
+        if background=True); failures are reported through log()."""
+        lazy = [key for key, action in list(self.actions.items())
+                if isinstance(action[1], str)]
+
+        def work() -> None:
+            startt = time.perf_counter()
+            for key in lazy:
+                try:
+                    self._action(key)
+                except Exception as e:
+                    self.log(f"{RED}Cannot import {key}) "
+                             f"{self.actions[key][1]}: {e}{RESET}")
+            if lazy:
+                self.log(f"{GREEN}Preloaded {len(lazy)} action(s) in "
+                         f"{time.perf_counter() - startt:.2f} s.{RESET}")
+
+        if not background:
+            work()
+            return None
+        thread = threading.Thread(target=work, name="devmenu-preload",
+                                  daemon=True)
+        thread.start()
+        return thread
+
+    def import_report(self) -> List[Tuple[str, str, float]]:
+        """(key, import path, seconds) of imported actions, slowest first."""
+        loaded = dict(self._loaded)
+        rows = [(key, loaded[key][0], seconds)
+                for key, seconds in list(self.import_times.items())
+                if key in loaded]
+        return sorted(rows, key=lambda row: -row[2])
+
+    def _inputs(self, key: str) -> Tuple[Any, ...]:
+        """Results of the dependencies of `key` (running them if needed)."""
+        upstream = self.deps.get(key, ())
+        if not upstream:
+            return ()
+        results, _ = self._pipeline(upstream)
+        return tuple(results[dep] for dep in upstream)
+
+    def _memo(
+     self,
+     key: str,
+     args: Tuple[Any, ...],
+     kwargs: Dict[Any, Any]) -> Optional[Tuple[ActionCache, str]]:
+        cache = self.caches.get(key)
+        if cache is None:
+            return None
+        ckey = cache.key(args, kwargs)
+        return None if ckey is None else (cache, ckey)
+
+    def _call(self, key: str) -> Tuple[bool, Any]:
+        """Execute action by key (via run_action) unless its result is
+        cached; returns (cached, result)."""
+        name, fnc, args, kwargs = self._action(key)
+        args = self._inputs(key) + tuple(args)
+        memo = self._memo(key, args, kwargs)
+        stats = self.stats[key]
+        if memo is not None:
+            hit, value = memo[0].get(memo[1])
+            if hit:
+                stats.hit()
+                return True, value
+
+        @functools.wraps(fnc)
+        def measured(*args, **kwargs):
+            startt = time.perf_counter()
+            try:
+                res = fnc(*args, **kwargs)
+            except BaseException:
+                stats.record(time.perf_counter() - startt, False)
+                raise
+            stats.record(time.perf_counter() - startt)
+            if memo is not None:
+                memo[0].put(memo[1], res)
+            return res
+        return False, self.run_action(measured, args, kwargs)
+
+    def do(self, key: str) -> Any:
+        """Programmatically execute action by key."""
+        return self._call(key)[1]
+
+    def submit(
+     self,
+     key: str,
+     *inputs: Any,
+     kwargs: Optional[Dict[Any, Any]] = None) -> Future:
+        """Run action by key on the executor; returns a Future.
+        `inputs` are passed before the action's own args, `kwargs`
+        override its own kwargs."""
+        _, _, args, own_kwargs = self._action(key)
+        kwargs = {**own_kwargs, **kwargs} if kwargs else own_kwargs
+        outer: Future = Future()
+        outer.kwargs = kwargs
+        memo = self._memo(key, inputs + tuple(args), kwargs)
+        if memo is not None:
+            hit, value = memo[0].get(memo[1])
+            if hit:
+                self.stats[key].hit()
+                outer.cached = True
+                outer.set_result(value)
+                return outer
+            outer.memo = memo
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    thread_name_prefix="devmenu")
+                self._own_executor = True
+            limit = self.limits.get(key)
+            if limit is not None and self._running[key] >= limit:
+                self._pending[key].append((outer, inputs))
+                return outer
+            self._running[key] += 1
+        self._start(key, outer, inputs)
+        return outer
+
+    def do_many(self, keys: Iterable[str]) -> List[Future]:
+        """Submit several actions at once, dependencies resolved;
+        returns their Futures."""
+        return [self._submit_resolved(key) for key in keys]
+
+    def _submit_resolved(
+     self,
+     key: str,
+     args: Tuple[Any, ...] = (),
+     kwargs: Optional[Dict[Any, Any]] = None) -> Future:
+        """submit() with the dependency results of `key` as leading
+        inputs; they are resolved in a thread of their own, so the caller
+        does not block. Without args/kwargs the action always runs, but as
+        a pipeline node, so that dependants resolved meanwhile (e.g. by
+        another socket request) share this run instead of starting one."""
+        _, _, own_args, own_kwargs = self._action(key)
+        upstream = self.deps.get(key, ())
+        node = not args and not kwargs
+        if not upstream and not node:
+            return self.submit(key, *args, kwargs=kwargs)
+        outer: Future = Future()
+
+        def chain(inner: Future) -> None:
+            outer.elapsed = getattr(inner, "elapsed", 0.0)
+            outer.cached = getattr(inner, "cached", False)
+            if inner.exception() is not None:
+                outer.set_exception(inner.exception())
+            else:
+                outer.set_result(inner.result()[0] if node
+                                 else inner.result())
+
+        def resolve() -> None:
+            try:
+                results, versions = self._pipeline(upstream)
+                inputs = tuple(results[dep] for dep in upstream)
+                if node:
+                    signature = (tuple(versions[dep] for dep in upstream),
+                                 own_args, own_kwargs)
+                    inner = self._node(key, signature, inputs, force=True,
+                                       join=False)
+                else:
+                    inner = self.submit(key, *inputs, *args, kwargs=kwargs)
+            except BaseException as e:
+                outer.set_exception(e)
+                return
+            inner.add_done_callback(chain)
+
+        if not upstream:
+            resolve()
+            return outer
 
-        name, fnc, args, kwargs = action
-        self.run_action(fnc, args, kwargs)
+        threading.Thread(target=resolve, name=f"devmenu-deps-{key}",
+                         daemon=True).start()
+        return outer
+
+    def serve(
+     self,
+     path: Union[str, Path],
+     background: bool = False) -> Optional[threading.Thread]:
+        """Accept action requests on a Unix domain socket (see
+        _ControlHandler for the protocol). Blocks until stop_serving() or
+        Ctrl+C, or returns the server thread if background=True."""
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise RuntimeError("Unix domain sockets are not available here")
+        path = str(path)
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except OSError:
+                    os.unlink(path)  # stale socket of a dead server
+                else:
+                    raise OSError(f"{path} is already being served")
+        # created as 0600 right away: no window in which others may connect
+        umask = os.umask(0o077)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(
+                path, _ControlHandler)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        server.daemon_threads = True
+        server.menu = self
+        self._server = server
+        if background:
+            thread = threading.Thread(target=server.serve_forever,
+                                      name="devmenu-serve", daemon=True)
+            thread.start()
+            return thread
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self._server is server:
+                self._server = None
+                server.server_close()
+                Path(path).unlink(missing_ok=True)
+        return None
+
+    def stop_serving(self) -> None:
+        """Stop the socket server started by serve() and remove the socket."""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        Path(server.server_address).unlink(missing_ok=True)
+
+    def _start(self, key: str, outer: Future, inputs: Tuple) -> None:
+        # a slot for `key` is already taken here
+        while not outer.set_running_or_notify_cancel():
+            waiting = self._next(key)
+            if waiting is None:
+                return
+            outer, inputs = waiting
+        _, fnc, args, _ = self._action(key)
+        outer.started = time.perf_counter()
+        try:
+            inner = self.executor.submit(fnc, *inputs, *args, **outer.kwargs)
+        except Exception as e:
+            outer.set_exception(e)
+            self._release(key)
+            return
+        inner.add_done_callback(
+            lambda done: self._finish(key, outer, done))
+
+    def _finish(self, key: str, outer: Future, inner: Future) -> None:
+        exc = inner.exception()
+        outer.elapsed = time.perf_counter() - outer.started
+        self.stats[key].record(outer.elapsed, exc is None)
+        if exc is not None:
+            outer.set_exception(exc)
+        else:
+            memo = getattr(outer, "memo", None)
+            if memo is not None:
+                memo[0].put(memo[1], inner.result())
+            outer.set_result(inner.result())
+        self._release(key)
+
+    def _next(self, key: str) -> Optional[Tuple[Future, Tuple]]:
+        """Hand the slot of `key` to a waiting submission or free it."""
+        with self._lock:
+            if self._pending[key]:
+                return self._pending[key].popleft()
+            self._running[key] -= 1
+            return None
+
+    def _release(self, key: str) -> None:
+        waiting = self._next(key)
+        if waiting is not None:
+            self._start(key, *waiting)
+
+    def _graph(self, targets: Optional[Iterable[str]]) -> List[str]:
+        """Topological order of `targets` and everything they depend on."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(key: str) -> None:
+            if state.get(key) == 2:
+                return
+            if state.get(key) == 1:
+                raise ValueError(f"Dependency cycle through '{key}'")
+            self._action(key)
+            state[key] = 1
+            for dep in self.deps.get(key, ()):
+                visit(dep)
+            state[key] = 2
+            order.append(key)
+
+        for key in (self.actions if targets is None else targets):
+            visit(key)
+        return order
+
+    @staticmethod
+    def _equal(a: Tuple, b: Tuple) -> bool:
+        try:
+            return bool(a == b)
+        except Exception:
+            return False
+
+    def _same(self, key: str, signature: Tuple) -> bool:
+        node = self._nodes.get(key)
+        if node is None or key in self._dirty:
+            return False
+        return self._equal(node[0], signature)
+
+    def _node(
+     self,
+     key: str,
+     signature: Tuple,
+     inputs: Tuple[Any, ...],
+     force: bool = False,
+     join: bool = True) -> Future:
+        """Future of (result, version) of `key` run with `signature`: the
+        last result if nothing changed, the run already in flight with the
+        same signature (join=True), or a new run - so a node needed by
+        several concurrent callers runs once."""
+        with self._pipe_lock:
+            node = self._inflight.get(key)
+            if (join and node is not None
+                    and self._equal(node.signature, signature)):
+                return node
+            if not force and self._same(key, signature):
+                node = Future()
+                node.set_result(self._nodes[key][1:])
+                return node
+            node = Future()
+            node.signature = signature
+            self._inflight[key] = node
+
+        def finish(inner: Future) -> None:
+            exc = inner.exception()
+            with self._pipe_lock:
+                if self._inflight.get(key) is node:
+                    del self._inflight[key]
+                if exc is None:
+                    version = self._nodes.get(key, (None, None, 0))[2] + 1
+                    self._nodes[key] = (signature, inner.result(), version)
+                    self._dirty.discard(key)
+            node.elapsed = getattr(inner, "elapsed", 0.0)
+            node.cached = getattr(inner, "cached", False)
+            if exc is not None:
+                node.set_exception(exc)
+            else:
+                node.set_result((inner.result(), version))
+
+        try:
+            inner = self.submit(key, *inputs)
+        except BaseException as e:
+            inner = Future()
+            inner.set_exception(e)
+        inner.add_done_callback(finish)
+        return node
+
+    def pipeline(
+     self,
+     targets: Optional[Iterable[str]] = None,
+     force: bool = False) -> Dict[str, Any]:
+        """Run `targets` (default: all actions) with their dependencies as
+        a DAG on the executor and return {key: result}."""
+        return self._pipeline(targets, force)[0]
+
+    def _pipeline(
+     self,
+     targets: Optional[Iterable[str]] = None,
+     force: bool = False) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """pipeline() returning ({key: result}, {key: version})."""
+        order = self._graph(targets)
+        waiting = {key: set(self.deps.get(key, ())) for key in order}
+        results: Dict[str, Any] = {}
+        versions: Dict[str, int] = {}
+        running: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+
+        while waiting or running:
+            ready = [key for key, rest in waiting.items()
+                     if not rest and key not in running.values()]
+            for key in ([] if error else ready):
+                upstream = self.deps.get(key, ())
+                _, _, args, kwargs = self._action(key)
+                signature = (tuple(versions[dep] for dep in upstream),
+                             args, kwargs)
+                node = self._node(key, signature,
+                                  tuple(results[dep] for dep in upstream),
+                                  force)
+                running[node] = key
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                results[key], versions[key] = future.result()
+                del waiting[key]
+                for rest in waiting.values():
+                    rest.discard(key)
+        if error is not None:
+            raise error
+        return results, versions
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Force `key` (default: every action) to re-run in pipeline()
+        and drop its cached results."""
+        keys = list(self.actions) if key is None else [key]
+        with self._pipe_lock:
+            self._dirty.update(keys)
+        for k in keys:
+            if k in self.caches:
+                self.caches[k].clear()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of the per-action measurements."""
+        snapshot = {key: stats.snapshot()
+                    for key, stats in list(self.stats.items())}
+        for key, seconds in list(self.import_times.items()):
+            snapshot.setdefault(key, {})["import_time"] = seconds
+        return snapshot
+
+    def metrics_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.metrics(), indent=indent)
+
+    def _log_metrics(self) -> None:
+        for key in self.actions:
+            if key in self.stats:
+                self.log(f"{CYAN}{key}) {self.stats[key].summary()}{RESET}")
+        if not self.stats:
+            self.log(f"{CYAN}No actions run yet.{RESET}")
+        for key, path, seconds in self.import_report()[:3]:
+            self.log(f"{CYAN}import {key}) {path}: {seconds:.3f} s{RESET}")
+
+    def start_job(self, key: str, mode: Optional[str] = None) -> Job:
+        """Run action by key as a background job; returns the Job."""
+        mode = mode or self.background.get(key, "thread")
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown job mode '{mode}'")
+        self._action(key)
+        job = Job(next(self._job_ids), key, self._name(key), mode, self.log)
+        with self._lock:
+            if self._job_executor is None:
+                self._job_executor = ThreadPoolExecutor(
+                    self.job_workers, thread_name_prefix="devmenu-job")
+            for stream in ("stdout", "stderr"):
+                if not isinstance(getattr(sys, stream), _JobStream):
+                    setattr(sys, stream, _JobStream(getattr(sys, stream),
+                                                    stream))
+            self.jobs[job.id] = job
+        self.log(f"{CYAN}[job {job.id}] {job.name} queued ({mode}).{RESET}")
+        job._future = self._job_executor.submit(self._run_job, job)
+        return job
+
+    def _run_job(self, job: Job) -> None:
+        if job.cancelled:
+            job.state = "cancelled"
+            return
+        job.state = "running"
+        job.started = time.perf_counter()
+        _job_local.job = job
+        try:
+            _, fnc, args, kwargs = self._action(job.key)
+            args = self._inputs(job.key) + tuple(args)
+            if job.mode == "process":
+                job.result = self._run_job_process(job, fnc, args, kwargs)
+            else:
+                if _wants_job(fnc):
+                    kwargs = {**kwargs, "job": job}
+                job.result = fnc(*args, **kwargs)
+        except BaseException as e:
+            job.error = job.error or traceback.format_exc()
+            job.state = "cancelled" if job.cancelled else "failed"
+            self.log(f"{RED}[job {job.id}] {job.name} {job.state}: "
+                     f"{e}{RESET}")
+        else:
+            job.state = "cancelled" if job.cancelled else "done"
+            color = YELLOW if job.cancelled else GREEN
+            self.log(f"{color}[job {job.id}] {job.name} {job.state} in "
+                     f"{time.perf_counter() - job.started:.1f} s.{RESET}")
+        finally:
+            _job_local.job = None
+            job.finished = time.perf_counter()
+            self.stats[job.key].record(job.finished - job.started,
+                                       job.state == "done")
+
+    def _run_job_process(
+     self,
+     job: Job,
+     fnc: Callable[..., Any],
+     args: Tuple[Any, ...],
+     kwargs: Dict[Any, Any]) -> Any:
+        target = self.actions[job.key][1]  # import path stays a string
+        # no fork from a multi-threaded process (timer, executor threads)
+        ctx = multiprocessing.get_context("spawn")
+        channel = ctx.Queue()
+        job._process = ctx.Process(
+            target=_job_process, daemon=True,
+            args=(target, args, kwargs, _wants_job(fnc), channel))
+        job._process.start()
+        while True:
+            try:
+                msg = channel.get(timeout=0.2)
+            except queue.Empty:
+                if job._process.is_alive():
+                    continue
+                try:  # the last message may still be in the pipe
+                    msg = channel.get(timeout=0.2)
+                except queue.Empty:
+                    raise RuntimeError(f"job process exited with code "
+                                       f"{job._process.exitcode}") from None
+            kind = msg[0]
+            if kind in ("stdout", "stderr"):
+                job.write(msg[1], kind)
+            elif kind == "progress":
+                job.progress(msg[1], msg[2])
+            elif kind == "result":
+                job._process.join()
+                return pickle.loads(msg[1])
+            else:
+                job._process.join()
+                job.error = msg[1]
+                raise RuntimeError(msg[1].strip().splitlines()[-1])
+
+    def show_jobs(self) -> None:
+        """Full-screen job list: <id> shows the output of a job,
+        c<id> cancels it, <Enter> returns."""
+        self.screen.paused = True
+        self.screen.invalidate()
+        try:
+            while True:
+                print(f"{CURSOR_HOME}{CLEAR_SCREEN}", end="")
+                print(f"{BOLD}{YELLOW}=== Jobs ==={RESET}\n")
+                for job in list(self.jobs.values()):
+                    print(job.summary())
+                if not self.jobs:
+                    print("No jobs yet.")
+                choice = input(f"\n{CYAN}<id> = output, c<id> = cancel, "
+                               f"<Enter> = back: {RESET}").strip().lower()
+                if not choice:
+                    return
+                cancel = choice.startswith("c")
+                try:
+                    job = self.jobs[int(choice[1:] if cancel else choice)]
+                except (ValueError, KeyError):
+                    continue
+                if cancel:
+                    job.cancel()
+                    continue
+                print(f"{CURSOR_HOME}{CLEAR_SCREEN}", end="")
+                print(f"{BOLD}{YELLOW}=== Job {job.id}: {job.name} "
+                      f"({job.state}) ==={RESET}\n")
+                print(job.stdout, end="")
+                if job.stderr:
+                    print(f"{RED}{job.stderr}{RESET}", end="")
+                if job.error:
+                    print(f"{RED}{job.error}{RESET}", end="")
+                input(f"\n{CYAN}Press Enter to return...{RESET}")
+        finally:
+            self.screen.paused = False
+
+    def cancel_jobs(self) -> None:
+        """Cancel every queued or running job."""
+        for job in list(self.jobs.values()):
+            if job.state in ("queued", "running"):
+                job.cancel()
+
+    def close(self, cancel_jobs: bool = False) -> None:
+        """Stop the socket server, shut down the executor if it was created
+        by the menu, and the job workers (after the running jobs finish, or
+        cancelling them)."""
+        self.stop_serving()
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+            self._own_executor = False
+        if self._job_executor is not None:
+            if cancel_jobs:
+                self.cancel_jobs()
+            self._job_executor.shutdown(wait=True)
+            self._job_executor = None
 
     def run(self) -> None:
         if self.auto:
             return
 
+        self.show_menu()
+        if self.background_preload:
+            self.preload(background=True)
         while True:
             self.show_menu()
             choice = input(f"{BLUE}Choose an option: {RESET}").strip().lower()
             if choice == "q":
                 self.log(f"{GREEN}Exiting menu...{RESET}")
+                self.show_menu()
+                self.cancel_jobs()
+                running = [job for job in self.jobs.values()
+                           if job.state == "running" and job.mode == "thread"]
+                if running:
+                    # their workers are not daemons: the exit waits for them
+                    print(f"{YELLOW}Waiting for {len(running)} running "
+                          f"job(s) to finish: "
+                          f"{', '.join(job.name for job in running)}{RESET}")
                 break
-            if choice in self.actions:
-                _, fnc, args, kwargs = self.actions[choice]
-                self.run_action(fnc, args, kwargs)
-                self.log(f"{GREEN}{fnc.__name__} finished.{RESET}")
+            if choice.startswith("!") and self.caches:
+                key = choice[1:].strip() or None
+                self.invalidate(key)
+                self.log(f"{GREEN}Cache cleared"
+                         f"{f' for {key}' if key else ''}.{RESET}")
+            elif choice == "&":
+                self.show_jobs()
+            elif choice.startswith("&") or choice in self.background:
+                key = choice.lstrip("&").strip()
+                try:
+                    self.start_job(key)
+                except (KeyError, ValueError) as e:
+                    self.log(f"{RED}Cannot start job: {e}{RESET}")
+            elif choice in self.actions:
+                name = self._name(choice)
+                try:
+                    cached, _ = self._call(choice)
+                except Exception as e:
+                    self.log(f"{RED}Cannot run {name}: {e}{RESET}")
+                    continue
+                stats = self.stats[choice]
+                if cached:
+                    self.log(f"{GREEN}{name}: cached result.{RESET}")
+                elif stats.last_ok:
+                    self.log(f"{GREEN}{name} finished in "
+                             f"{stats.last:.3f} s (#{stats.calls}).{RESET}")
+                else:
+                    self.log(f"{RED}{name} failed after "
+                             f"{stats.last:.3f} s ({stats.errors} errors "
+                             f"in {stats.calls} calls).{RESET}")
+            elif choice == "?":
+                self._log_metrics()
             else:
                 self.log(f"{RED}Invalid choice. Try again.{RESET}")
             if not choice:
                 continue
 
-def select_from_list(items: List, title: str = "Select item") -> Any:
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """
+    One client connection of DevMenu.serve(). The protocol is JSON lines:
+
+        "plot"                                    action key only
+        {"key": "plot", "args": [..], "kwargs": {..}, "id": ..}
+        ["load", {"key": "plot", "args": [1]}]    a batch
+
+    Requests are dispatched through submit() as soon as their line is read
+    (pipelining: the client does not have to wait for answers), so limits,
+    caches and metrics apply as usual. Every request gets one response
+    line as soon as it finishes, in completion order:
+
+        {"id": .., "key": .., "ok": true, "result": .., "cached": false,
+         "elapsed": <s since the line was read>, "run": <s of the action>}
+
+    with "error" instead of "result" on failure; results that are not
+    JSON serializable are sent as repr(). A batch ends with
+    {"batch": <id>, "done": <count>, "elapsed": ..}. The id defaults to
+    the line number ("<line>.<n>" inside a batch).
+    """
+    def setup(self) -> None:
+        super().setup()
+        self._cond = threading.Condition()
+        self._open = 0
+
+    def _send(self, msg: Dict[str, Any]) -> None:
+        try:
+            data = json.dumps(msg, default=repr)
+        except (TypeError, ValueError):
+            msg["result"] = repr(msg.get("result"))
+            data = json.dumps(msg, default=repr)
+        with self._cond:
+            try:
+                self.wfile.write(data.encode() + b"\n")
+                self.wfile.flush()
+            except OSError:
+                pass  # the client is gone, its actions still finish
+
+    def _dispatch(self, req: Any, rid: Any, received: float,
+                  finished: Callable[[], None]) -> None:
+        if isinstance(req, str):
+            req = {"key": req}
+        key = req.get("key") if isinstance(req, dict) else None
+        try:
+            if key is None:
+                raise ValueError("request without a 'key'")
+            rid = req.get("id", rid)
+            future = self.server.menu._submit_resolved(
+                str(key), tuple(req.get("args") or ()), req.get("kwargs"))
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+
+        def reply(done: Future) -> None:
+            exc = done.exception()
+            msg = {"id": rid, "key": key, "ok": exc is None,
+                   "cached": getattr(done, "cached", False),
+                   "elapsed": time.perf_counter() - received,
+                   "run": getattr(done, "elapsed", 0.0)}
+            if exc is None:
+                msg["result"] = done.result()
+            else:
+                msg["error"] = f"{type(exc).__name__}: {exc}"
+            self._send(msg)
+            finished()
+
+        future.add_done_callback(reply)
+
+    def handle(self) -> None:
+        for number, line in enumerate(self.rfile, 1):
+            if not line.strip():
+                continue
+            received = time.perf_counter()
+            try:
+                msg = json.loads(line)
+            except ValueError as e:
+                self._send({"id": number, "ok": False,
+                            "error": f"Bad request: {e}"})
+                continue
+            batch = isinstance(msg, list)
+            requests = msg if batch else [msg]
+            left = [len(requests)]
+
+            def finished(number: int = number, received: float = received,
+                         left: List[int] = left, batch: bool = batch,
+                         count: int = len(requests)) -> None:
+                with self._cond:
+                    left[0] -= 1
+                    if batch and not left[0]:
+                        self._send({"batch": number, "done": count,
+                                    "elapsed": time.perf_counter() - received})
+                    self._open -= 1
+                    self._cond.notify_all()
+
+            with self._cond:
+                self._open += len(requests)
+            if batch and not requests:
+                self._send({"batch": number, "done": 0, "elapsed": 0.0})
+            for i, req in enumerate(requests, 1):
+                self._dispatch(req, f"{number}.{i}" if batch else number,
+                               received, finished)
+        # the client closed its side: answer what is still running
+        with self._cond:
+            self._cond.wait_for(lambda: not self._open)
+
+
+def remote_do(
+     path: Union[str, Path],
+     requests: Iterable[Union[str, Dict[str, Any]]],
+     batch: bool = False) -> Iterable[Dict[str, Any]]:
+    """
+    Client of DevMenu.serve(): sends the requests (action keys or request
+    dicts) pipelined, or as one batch, and yields the response dicts as
+    the actions finish.
+
+        for res in remote_do("/tmp/etl.sock", ["load", {"key": "plot"}]):
+            print(res["key"], res["ok"], res["run"])
+    """
+    requests = list(requests)
+    lines = [requests] if batch else requests
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(b"".join(
+            json.dumps(line).encode() + b"\n" for line in lines))
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("rb") as replies:
+            for line in replies:
+                yield json.loads(line)
+
+
+class _NoLimit:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+_NO_LIMIT = _NoLimit()
+
+
+class AsyncDevMenu(DevMenu):
+    """
+    DevMenu for asyncio programs: same constructor and action dictionary,
+    but do(), do_many() and run() are coroutines.
+
+        menu = AsyncDevMenu(actions, title="Async Demo")
+        asyncio.run(menu.run())
+
+        node = AsyncDevMenu(actions, auto=True)
+        result = await node.do("fetch")
+
+    - "async def" actions are awaited; plain functions run in the executor
+      (the loop's default one if none was given), so they do not block
+      the loop
+    - run() reads keys in a worker thread; a chosen action starts as a
+      background task and the menu comes back at once, while start,
+      finish and errors of the task are reported through log()
+    - dependencies are resolved concurrently, a shared dependency runs
+      only once per call; caches and limits work as in DevMenu
+    - on "q" the still running tasks are cancelled (plain functions
+      already running in a thread finish on their own)
+    - the inherited synchronous API (submit(), pipeline(), start_job(),
+      serve()) handles plain functions only and raises TypeError for
+      coroutine actions - use do(), do_many() and start() for those
+    - there is no "&" job menu and `background` is not used: every action
+      chosen in run() already runs as a background task (see start())
+    """
+    job_menu = False
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.tasks: set = set()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _sync_only(self, key: str) -> None:
+        if inspect.iscoroutinefunction(self._action(key)[1]):
+            raise TypeError(
+                f"'{key}' is a coroutine action: use await do(), "
+                f"do_many() or start()")
+
+    def submit(
+     self,
+     key: str,
+     *inputs: Any,
+     kwargs: Optional[Dict[Any, Any]] = None) -> Future:
+        self._sync_only(key)
+        return super().submit(key, *inputs, kwargs=kwargs)
+
+    def start_job(self, key: str, mode: Optional[str] = None) -> Job:
+        self._sync_only(key)
+        return super().start_job(key, mode)
+
+    async def _invoke(
+     self,
+     fnc: Callable[..., Any],
+     args: Tuple[Any, ...],
+     kwargs: Dict[Any, Any]) -> Any:
+        if inspect.iscoroutinefunction(fnc):
+            return await fnc(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        res = await loop.run_in_executor(
+            self.executor, functools.partial(fnc, *args, **kwargs))
+        if inspect.isawaitable(res):
+            res = await res
+        return res
+
+    async def _resolve(self, key: str, shared: Dict[str, asyncio.Future]) -> Any:
+        if key not in shared:
+            shared[key] = asyncio.ensure_future(self._execute(key, shared))
+        return (await shared[key])[1]
+
+    async def _execute(
+     self,
+     key: str,
+     shared: Dict[str, asyncio.Future]) -> Tuple[bool, Any]:
+        """Run action by key unless its result is cached; returns
+        (cached, result)."""
+        _, fnc, args, kwargs = self._action(key)
+        inputs = await asyncio.gather(
+            *(self._resolve(dep, shared) for dep in self.deps.get(key, ())))
+        args = tuple(inputs) + tuple(args)
+        memo = self._memo(key, args, kwargs)
+        stats = self.stats[key]
+        if memo is not None:
+            hit, value = memo[0].get(memo[1])
+            if hit:
+                stats.hit()
+                return True, value
+        limit = self.limits.get(key)
+        if limit is not None and key not in self._semaphores:
+            self._semaphores[key] = asyncio.Semaphore(limit)
+        async with self._semaphores.get(key) or _NO_LIMIT:
+            startt = time.perf_counter()
+            try:
+                res = await self._invoke(fnc, args, kwargs)
+            except BaseException:
+                stats.record(time.perf_counter() - startt, False)
+                raise
+            stats.record(time.perf_counter() - startt)
+        if memo is not None:
+            memo[0].put(memo[1], res)
+        return False, res
+
+    async def do(self, key: str) -> Any:
+        """Execute action by key (awaiting it) and return its result."""
+        return (await self._execute(key, {}))[1]
+
+    async def do_many(self, keys: Iterable[str]) -> List[Any]:
+        """Execute several actions concurrently; returns their results."""
+        shared: Dict[str, asyncio.Future] = {}
+        return list(await asyncio.gather(
+            *(self._resolve(key, shared) for key in keys)))
+
+    def start(self, key: str) -> asyncio.Task:
+        """Run action by key as a background task reporting to log()."""
+        task = asyncio.create_task(self._background(key))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def _background(self, key: str) -> Any:
+        name = self._name(key)
+        self.log(f"{CYAN}{name} started.{RESET}")
+        try:
+            cached, res = await self._execute(key, {})
+        except asyncio.CancelledError:
+            self.log(f"{YELLOW}{name} cancelled.{RESET}")
+            raise
+        except Exception as e:
+            self.log(f"{RED}Error in {name}: {e}{RESET}")
+            if self.dev_mode:
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                self.log(f"{RED}  at {frame.filename}:{frame.lineno} "
+                         f"in {frame.name}{RESET}")
+            return None
+        if cached:
+            self.log(f"{GREEN}{name}: cached result.{RESET}")
+        else:
+            self.log(f"{GREEN}{name} finished in "
+                     f"{self.stats[key].last:.3f} s.{RESET}")
+        return res
+
+    async def run(self) -> None:
+        if self.auto:
+            return
+
+        self.show_menu()
+        if self.background_preload:
+            self.preload(background=True)
+        while True:
+            self.show_menu()
+            choice = await asyncio.to_thread(
+                input, f"{BLUE}Choose an option: {RESET}")
+            choice = choice.strip().lower()
+            if choice == "q":
+                self.log(f"{GREEN}Exiting menu...{RESET}")
+                self.show_menu()
+                break
+            if choice.startswith("!") and self.caches:
+                key = choice[1:].strip() or None
+                self.invalidate(key)
+                self.log(f"{GREEN}Cache cleared"
+                         f"{f' for {key}' if key else ''}.{RESET}")
+            elif choice in self.actions:
+                self.start(choice)
+            elif choice == "?":
+                self._log_metrics()
+            elif choice:
+                self.log(f"{RED}Invalid choice. Try again.{RESET}")
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+class _ItemIndex:
+    """
+    Lazily grown index over any iterable: items are pulled from the source
+    only when a page or a search needs them, their display names are kept
+    (lower-cased) for searching.
+    """
+    def __init__(self, items: Iterable[Any]):
+        self.items: List[Any] = []
+        self.names: List[str] = []
+        self.keys: List[str] = []
+        self._source = iter(items)
+        self.exhausted = False
+
+    def fill(self, count: int) -> int:
+        """Make sure at least `count` items are loaded; returns how many are."""
+        while not self.exhausted and len(self.items) < count:
+            try:
+                item = next(self._source)
+            except StopIteration:
+                self.exhausted = True
+                break
+            name = item.name if isinstance(item, Path) else str(item)
+            self.items.append(item)
+            self.names.append(name)
+            self.keys.append(name.lower())
+        return len(self.items)
+
+
+class _Search:
+    """Matches of one query over an _ItemIndex, scanned page by page."""
+    def __init__(self, index: _ItemIndex, query: str, fuzzy: bool,
+                 previous: Optional["_Search"] = None):
+        self.index = index
+        self.query = query.lower()
+        self.fuzzy = fuzzy
+        self.matches: List[int] = []
+        self._scanned = 0
+        # a refined query only has to re-check what the previous one matched
+        if (previous is not None and previous.fuzzy == fuzzy
+                and self.query.startswith(previous.query)):
+            self.matches = [i for i in previous.matches
+                            if self._match(index.keys[i])]
+            self._scanned = previous._scanned
+
+    def _match(self, key: str) -> bool:
+        if not self.fuzzy:
+            return self.query in key
+        pos = 0
+        for char in self.query:
+            pos = key.find(char, pos) + 1
+            if not pos:
+                return False
+        return True
+
+    def fill(self, count: int, chunk: int = 4096) -> int:
+        while len(self.matches) < count:
+            loaded = self.index.fill(self._scanned + chunk)
+            if self._scanned >= loaded:
+                break
+            keys = self.index.keys
+            self.matches.extend(i for i in range(self._scanned, loaded)
+                                if self._match(keys[i]))
+            self._scanned = loaded
+        return len(self.matches)
+
+    @property
+    def complete(self) -> bool:
+        return self.index.exhausted and self._scanned >= len(self.index.items)
+
+
+def select_from_list(
+ items: Iterable[Any],
+ title: str = "Select item",
+ page_size: int = 20) -> Any:
     """
     Displays numbered list and returns selected element.
+
+    Items may come from any iterable, including generators: they are read
+    only as far as the shown page or a search needs. Long lists are paged:
+        <number>   select item by its number
+        n / <Enter>, p   next / previous page
+        /text      show items containing "text" (case-insensitive)
+        ~text      fuzzy search: the letters of "text" in this order
+        /  or  ~   clear the search
+        q          quit (returns None)
+    Typing a longer query after a shorter one only re-checks the previous
+    matches.
     """
-    if not items:
+    index = _ItemIndex(items)
+    if not index.fill(1):
         print(f"\033[1;31mNo items available for selection.\033[0m")
         return None
 
-    print(f"\n\033[1;36m{title}\033[0m\n")
-    for i, item in enumerate(items, start=1):
-        name = item.name if isinstance(item, Path) else str(item)
-        print(f"{i}. {name}")
-
+    search: Optional[_Search] = None
+    page = 0
     while True:
-        try:
-            choice = input("\n→ Enter number or \"q\" to quit: ")
+        first, last = page * page_size, (page + 1) * page_size
+        if search is None:
+            loaded = index.fill(last + 1)
+            shown = range(first, min(last, loaded))
+            more = loaded > last
+            total = f"{loaded}" if index.exhausted else f"{loaded}+"
+        else:
+            found = search.fill(last + 1)
+            shown = search.matches[first:last]
+            more = found > last
+            total = f"{found}{'' if search.complete else '+'} found"
+        single = page == 0 and not more and search is None
+
+        header = title if single else (f"{title}  [page {page + 1}, "
+                                       f"{total}]")
+        if search is not None:
+            header += f"  {'~' if search.fuzzy else '/'}{search.query}"
+        print(f"\n\033[1;36m{header}\033[0m\n")
+        for i in shown:
+            print(f"{i + 1}. {index.names[i]}")
+        if not shown:
+            print("\033[1;31mNothing found.\033[0m")
+
+        if single:
+            prompt = "\n→ Enter number or \"q\" to quit: "
+        else:
+            prompt = ("\n→ Number, \"n\"/\"p\" page, \"/text\" search, "
+                      "\"~text\" fuzzy or \"q\" to quit: ")
+        while True:
+            choice = input(prompt).strip()
             if choice.lower() == "q":
                 return None
-            elif 1 <= int(choice) <= len(items):
-                return items[int(choice) - 1]
-        except ValueError:
-            pass
-        print("\033[1;31mInvalid choice, try again.\033[0m")
+            if choice.lower() in ("n", "") and not single:
+                page += more
+                break
+            if choice.lower() == "p" and not single:
+                page = max(page - 1, 0)
+                break
+            if choice[:1] in ("/", "~"):
+                query = choice[1:]
+                search = (_Search(index, query, choice[0] == "~", search)
+                          if query else None)
+                page = 0
+                break
+            try:
+                number = int(choice)
+                if 1 <= number <= index.fill(number):
+                    return index.items[number - 1]
+            except ValueError:
+                pass
+            print("\033[1;31mInvalid choice, try again.\033[0m")
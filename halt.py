@@ -1,10 +1,688 @@
 # halt.py
 
-import timeit
+import argparse
+import asyncio
+import atexit
+import contextvars
+import csv
+import functools
+import gc
+import hashlib
 import inspect
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import socket
+import statistics
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+import types
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Record:
+    '''One measured call of a target function.
+
+    wall   - elapsed wall time, seconds (for coroutines: including awaits)
+    cpu    - on-CPU time of the calling thread, seconds (for coroutines:
+             only the slices where the coroutine itself was running)
+    thread - name of the thread the call ran in
+    task   - name of the asyncio task the call ran in, or None
+    mem_peak, mem_net - peak and net traced allocation during the call,
+             bytes (None when the call was not traced)
+    mem_top - [(file:line, bytes), ...] source lines holding the most
+             newly allocated memory at the end of the call
+    args   - short digest of the call arguments (only while a sink is set)
+    samples, hot - number of stack samples and [(file:line func, count),
+             ...] hottest lines, for calls made through halt.sample
+'''
+    name: str
+    wall: float
+    cpu: float
+    thread: str
+    task: str | None = None
+    is_async: bool = False
+    mem_peak: int | None = None
+    mem_net: int | None = None
+    mem_top: list[tuple[str, int]] | None = None
+    args: str | None = None
+    samples: int | None = None
+    hot: list[tuple[str, int]] | None = None
+
+
+@dataclass
+class _Node:
+    calls: int = 0
+    total: float = 0.0
+    children: dict[str, '_Node'] = field(default_factory=dict)
+
+    def exclusive(self) -> float:
+        return max(0.0, self.total - sum(c.total
+                                         for c in self.children.values()))
+
+
+_tree = _Node()
+_tree_lock = threading.Lock()
+_path: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar(
+    'halt_path', default=())
+
+_print_lock = threading.Lock()
+_last: contextvars.ContextVar[Record | None] = contextvars.ContextVar(
+    'halt_last', default=None)
+
+
+_trace_lock = threading.Lock()
+_trace_users = 0
+_trace_owned = False
+_TOP_DEFAULT = 3
+
+
+def _mem_plan(memory: bool | int, sample: float) -> int | None:
+    '''Number of top lines to collect, or None if this call is not traced.'''
+    if memory is False or memory is None or (sample < 1.0 and random.random() >= sample):
+        return None
+    return _TOP_DEFAULT if memory is True else int(memory)
+
+
+def _mem_start(top: int) -> tuple[int, tracemalloc.Snapshot | None]:
+    global _trace_users, _trace_owned
+    with _trace_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace_owned = True
+        _trace_users += 1
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    return base, tracemalloc.take_snapshot() if top else None
+
+
+def _mem_stop(state: tuple, top: int, rec: Record) -> None:
+    global _trace_users, _trace_owned
+    base, before = state
+    try:
+        current, peak = tracemalloc.get_traced_memory()
+        rec.mem_peak, rec.mem_net = peak - base, current - base
+        if top:
+            skip = (tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__))
+            diff = tracemalloc.take_snapshot().filter_traces(skip).compare_to(
+                before.filter_traces(skip), 'lineno')
+            rec.mem_top = [
+                (f'{st.traceback[0].filename}:{st.traceback[0].lineno}',
+                 st.size_diff)
+                for st in diff[:top] if st.size_diff > 0]
+    finally:
+        with _trace_lock:
+            _trace_users -= 1
+            if not _trace_users and _trace_owned:
+                tracemalloc.stop()
+                _trace_owned = False
+
+
+def _origin() -> tuple[str, str | None]:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.current_thread().name, task.get_name() if task else None
+
+
+def _hms(timee: float) -> str:
+    hourr = int(timee // 3600)
+    minutee = int(timee % 3600 // 60)
+    secondd = timee % 60
+    return f'{hourr:02d} h {minutee:02d} min {secondd:.8f} s'
+
+
+def _kib(size: int) -> str:
+    return f'{size / 1024:.1f} KiB'
+
+
+def _emit(text: str) -> None:
+    # one print per report, so that reports of parallel threads
+    # do not interleave line by line
+    with _print_lock:
+        print(text)
+
+
+def _commit(rec: Record) -> None:
+    _last.set(rec)
+    halt.records.append(rec)
+    where = rec.thread if rec.task is None else f'{rec.thread}/{rec.task}'
+    text = (f'\n\033[1m\033[7m\033[32m {rec.name} \033[0m time:  [{where}]\n'
+            f'{_hms(rec.wall)}  (cpu {rec.cpu:.8f} s)\n')
+    if rec.mem_peak is not None:
+        text += f'memory: peak {_kib(rec.mem_peak)}, net {_kib(rec.mem_net)}\n'
+        for line, size in rec.mem_top or ():
+            text += f'    {_kib(size):>12}  {line}\n'
+    _emit(text)
+    if _sinks:
+        _write(rec)
+
+
+def _push(name: str) -> tuple[tuple[str, ...], contextvars.Token]:
+    path = _path.get() + (name,)
+    return path, _path.set(path)
+
+
+def _pop(path: tuple[str, ...], token: contextvars.Token,
+         elapsed: float) -> None:
+    _path.reset(token)
+    with _tree_lock:
+        node = _tree
+        for name in path:
+            node = node.children.setdefault(name, _Node())
+        node.calls += 1
+        node.total += elapsed
+
+
+class _Section:
+    '''Context manager timing a block as a node of the halt call tree.'''
+
+    def __init__(self, name: str):
+        self.name = name
+        self._frames: list[tuple] = []
+
+    def __enter__(self):
+        path, token = _push(self.name)
+        self._frames.append((path, token, timeit.default_timer()))
+        return self
+
+    def __exit__(self, *exc):
+        path, token, startt = self._frames.pop()
+        _pop(path, token, timeit.default_timer() - startt)
+        return False
+
+
+def _render() -> str:
+    lines = []
+
+    def walk(node: _Node, prefix: str) -> None:
+        items = sorted(node.children.items(), key=lambda kv: -kv[1].total)
+        for i, (name, child) in enumerate(items):
+            last = i == len(items) - 1
+            lines.append(f'{prefix}{"└── " if last else "├── "}{name}  '
+                         f'x{child.calls}  incl {child.total:.6f} s  '
+                         f'excl {child.exclusive():.6f} s')
+            walk(child, prefix + ("    " if last else "│   "))
+
+    with _tree_lock:
+        walk(_tree, '')
+    return '\n'.join(lines)
+
+
+def _collapsed(path: str | None = None) -> str:
+    lines = []
+
+    def walk(node: _Node, stack: tuple[str, ...]) -> None:
+        for name, child in node.children.items():
+            micros = int(child.exclusive() * 1e6)
+            if micros:
+                lines.append(f'{";".join(stack + (name,))} {micros}')
+            walk(child, stack + (name,))
+
+    with _tree_lock:
+        walk(_tree, ())
+    text = '\n'.join(lines)
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    return text
+
+
+def _reset() -> None:
+    with _tree_lock:
+        _tree.children.clear()
+    halt.records.clear()
+
+
+@types.coroutine
+def _drive(coro, cpu: list[float]):
+    '''Run "coro" step by step, adding thread CPU time of every step
+    to cpu[0]; time spent suspended in awaits is not counted.'''
+    value, exc = None, None
+    while True:
+        startc = time.thread_time()
+        try:
+            if exc is None:
+                yielded = coro.send(value)
+            else:
+                yielded = coro.throw(exc)
+        except StopIteration as e:
+            cpu[0] += time.thread_time() - startc
+            return e.value
+        except BaseException:
+            cpu[0] += time.thread_time() - startc
+            raise
+        cpu[0] += time.thread_time() - startc
+        try:
+            value, exc = (yield yielded), None
+        except BaseException as e:
+            value, exc = None, e
+
+
+def _call(fnc, args: tuple, kwargs: dict, top: int | None = None):
+    thread, task = _origin()
+    mem = _mem_start(top) if top is not None else None
+    path, token = _push(fnc.__name__)
+    startc = time.thread_time()
+    startt = timeit.default_timer()
+    try:
+        res = fnc(*args, **kwargs)
+    finally:
+        timee = timeit.default_timer() - startt
+        _pop(path, token, timee)
+        rec = Record(fnc.__name__, timee, time.thread_time() - startc,
+                     thread, task)
+        if mem is not None:  # also on errors: releases tracemalloc
+            _mem_stop(mem, top, rec)
+    if _sinks:
+        rec.args = _digest(args, kwargs)
+    _commit(rec)
+    return res
+
+
+async def _acall(fnc, args: tuple, kwargs: dict, top: int | None = None):
+    thread, task = _origin()
+    mem = _mem_start(top) if top is not None else None
+    path, token = _push(fnc.__name__)
+    cpu = [0.0]
+    startt = timeit.default_timer()
+    try:
+        res = await _drive(fnc(*args, **kwargs), cpu)
+    finally:
+        timee = timeit.default_timer() - startt
+        _pop(path, token, timee)
+        rec = Record(fnc.__name__, timee, cpu[0], thread, task, True)
+        if mem is not None:  # also on errors: releases tracemalloc
+            _mem_stop(mem, top, rec)
+    if _sinks:
+        rec.args = _digest(args, kwargs)
+    _commit(rec)
+    return res
 
 
-def halt(fnc=None):
+def _time(*args, fnc, memory=False, sample=1.0, target_kwargs=None,
+          **kwargs):
+    top = _mem_plan(memory, sample)
+    kwargs.update(target_kwargs or {})
+    if inspect.iscoroutinefunction(fnc):
+        return _acall(fnc, args, kwargs, top)
+    return _call(fnc, args, kwargs, top)
+
+
+def _sample(*args, fnc, interval_ms=5.0, top=10, max_overhead=0.02,
+            target_kwargs=None, **kwargs):
+    '''Run fnc(*args, **kwargs) under a sampling profiler: a background
+    thread reads the stack of the calling thread via sys._current_frames
+    every interval_ms and counts hot lines and functions. The interval is
+    stretched automatically (from the average cost of a read, never
+    below interval_ms) so that sampling costs at most max_overhead of
+    the run time.'''
+    kwargs.update(target_kwargs or {})
+    if inspect.iscoroutinefunction(fnc):
+        raise TypeError('halt.sample supports regular functions only')
+    if not interval_ms > 0 or not max_overhead > 0:
+        raise ValueError('interval_ms and max_overhead must be positive')
+    target = threading.get_ident()
+    lines: Counter = Counter()
+    funcs: Counter = Counter()
+    stats = {'samples': 0, 'reads': 0, 'cost': 0.0,
+             'interval': interval_ms / 1000}
+    done = threading.Event()
+
+    @functools.wraps(fnc)
+    def sampled(*args, **kwargs):
+        try:
+            return fnc(*args, **kwargs)
+        finally:
+            done.set()  # halt's own reporting is not sampled
+    stop = sampled.__code__
+
+    def sampler() -> None:
+        while not done.wait(stats['interval']):
+            startc = timeit.default_timer()
+            frame = sys._current_frames().get(target)
+            leaf, keys = None, []
+            while frame is not None and frame.f_code is not stop:
+                code = frame.f_code
+                if leaf is None:
+                    leaf = code.co_filename, frame.f_lineno, code.co_name
+                keys.append((code.co_filename, code.co_firstlineno,
+                             code.co_name))
+                frame = frame.f_back
+            if frame is not None:
+                # the target was still running when the stack was read
+                if leaf is not None:
+                    lines[leaf] += 1
+                funcs.update(set(keys))
+                stats['samples'] += 1
+            del frame
+            stats['reads'] += 1
+            stats['cost'] += timeit.default_timer() - startc
+            # from the running average: one slow read does not stick
+            stats['interval'] = max(
+                interval_ms / 1000,
+                stats['cost'] / stats['reads'] / max_overhead)
+
+    thread = threading.Thread(target=sampler, name='halt-sampler',
+                              daemon=True)
+    thread.start()
+    try:
+        res = _call(sampled, args, kwargs)
+    finally:
+        done.set()
+        thread.join()
+
+    rec = _last.get()
+    total = stats['samples']
+    rec.samples = total
+    rec.hot = [(f'{f}:{n} {name}', c) for (f, n, name), c
+               in lines.most_common(top)]
+    text = (f'\033[1m\033[7m\033[35m {fnc.__name__} \033[0m samples: {total}'
+            f'  interval: {stats["interval"] * 1000:.2f} ms'
+            f'  overhead: {stats["cost"] * 1000:.3f} ms'
+            f' ({stats["cost"] / rec.wall if rec.wall else 0:.2%})\n')
+    if total:
+        text += 'hot lines:\n'
+        for line, count in rec.hot:
+            text += f'  {count / total:7.1%}  {line}\n'
+        text += 'functions (inclusive):\n'
+        for (f, n, name), count in funcs.most_common(top):
+            text += f'  {count / total:7.1%}  {name}  ({f}:{n})\n'
+    _emit(text)
+    return res
+
+
+_bench_cpus = None
+
+
+def _bench_init(cpus) -> None:
+    global _bench_cpus
+    _bench_cpus = cpus
+
+
+def _bench_task(fnc, args: tuple, number: int, warmup: int) -> list[float]:
+    '''One round of one candidate, executed in a worker process. A CPU id
+    is borrowed from the shared queue (if any) for the whole round.'''
+    cpu = _bench_cpus.get() if _bench_cpus is not None else None
+    try:
+        if cpu is not None:
+            os.sched_setaffinity(0, {cpu})
+        for _ in range(warmup):
+            fnc(*args)
+        gc.collect()
+        times = []
+        for _ in range(number):
+            startt = timeit.default_timer()
+            fnc(*args)
+            times.append(timeit.default_timer() - startt)
+        return times
+    finally:
+        if cpu is not None:
+            _bench_cpus.put(cpu)
+
+
+def _bootstrap(values: list[float], rng: random.Random,
+               resamples: int = 2000) -> tuple[float, float]:
+    '''95% bootstrap confidence interval of the mean.'''
+    if len(values) < 2:
+        return values[0], values[0]
+    means = sorted(statistics.fmean(rng.choices(values, k=len(values)))
+                   for _ in range(resamples))
+    return means[int(resamples * 0.025)], means[int(resamples * 0.975) - 1]
+
+
+def _bench(candidates, inputs=None, rounds=10, number=5, warmup=1,
+           workers=None, baseline=None) -> list[dict]:
+    '''Benchmark competing implementations in isolated worker processes.
+
+    candidates - {name: callable} or [callable, ...]; callables must be
+                 importable (module-level), they are sent to "spawn"
+                 workers by reference
+    inputs     - [args, ...] to call every candidate with (a non-tuple
+                 item is a single argument); default: one call without
+                 arguments
+    rounds     - interleaved rounds; in every round each candidate runs
+                 "number" timed calls (after "warmup" calls) in a fresh
+                 process, the candidate order rotates from round to round
+    workers    - parallel processes (default: number of candidates, but
+                 no more than available CPUs); each worker is pinned to
+                 its own CPU where os.sched_setaffinity exists
+    baseline   - name of the reference candidate (default: the first)
+
+Prints a ranked table per input: median per call, 95% confidence
+interval of the per-round medians and speedup vs baseline with its
+interval (paired by round). Returns the table rows as dicts.'''
+    if not isinstance(candidates, dict):
+        candidates = {c.__name__: c for c in candidates}
+    names = list(candidates)
+    baseline = baseline or names[0]
+    inputs = [()] if inputs is None else [
+        x if isinstance(x, tuple) else (x,) for x in inputs]
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    workers = workers or min(len(names), len(cpus))
+    ctx = multiprocessing.get_context('spawn')
+    queue = None
+    if hasattr(os, 'sched_setaffinity'):
+        queue = ctx.Queue()
+        for cpu in cpus[:workers]:
+            queue.put(cpu)
+    try:
+        pool = ProcessPoolExecutor(workers, ctx, _bench_init, (queue,),
+                                   max_tasks_per_child=1)
+    except TypeError:  # Python < 3.11: processes are reused
+        pool = ProcessPoolExecutor(workers, ctx, _bench_init, (queue,))
+
+    # per_round[input_index][name] -> [median per call of every round]
+    per_round = [{name: [] for name in names} for _ in inputs]
+    with pool:
+        for r in range(rounds):
+            order = names[r % len(names):] + names[:r % len(names)]
+            futures = {(i, name): pool.submit(_bench_task, candidates[name],
+                                              args, number, warmup)
+                       for i, args in enumerate(inputs) for name in order}
+            for (i, name), future in futures.items():
+                per_round[i][name].append(statistics.median(future.result()))
+
+    rng = random.Random(0)
+    results = []
+    for i, args in enumerate(inputs):
+        label = repr(args)
+        if len(label) > 40:
+            label = label[:37] + '...'
+        base = per_round[i][baseline]
+        rows = []
+        for name in names:
+            values = per_round[i][name]
+            ratios = [b / v for b, v in zip(base, values) if v]
+            rows.append({'input': label, 'name': name,
+                         'median': statistics.median(values),
+                         'ci': _bootstrap(values, rng),
+                         'speedup': statistics.fmean(ratios) if ratios else 0.0,
+                         'speedup_ci': _bootstrap(ratios, rng) if ratios
+                         else (0.0, 0.0),
+                         'rounds': values})
+        rows.sort(key=lambda row: row['median'])
+        text = (f'\n\033[1m\033[7m\033[36m bench \033[0m input {label}, '
+                f'{rounds} rounds x {number} calls, {workers} worker(s), '
+                f'baseline: {baseline}\n')
+        for rank, row in enumerate(rows, 1):
+            low, high = row['ci']
+            s_low, s_high = row['speedup_ci']
+            color = '\033[32m' if rank == 1 else ''
+            text += (f'{color}{rank:2}. {row["name"]:24} '
+                     f'{row["median"]:.8f} s  [{low:.8f} .. {high:.8f}]  '
+                     f'x{row["speedup"]:.3f} [{s_low:.3f} .. {s_high:.3f}]'
+                     f'\033[0m\n')
+        _emit(text)
+        results.extend(rows)
+    return results
+
+
+def _params(*args, fnc, **kwargs):
+    params = inspect.getfullargspec(fnc),\
+        inspect.getcallargs(fnc, *args, **kwargs)
+    _emit(f'\n\033[1m\033[7m\033[36m {fnc.__name__} \033[0m \n {params} \n')
+    return fnc(*args, **kwargs)
+
+
+_FIELDS = ('time', 'name', 'args', 'wall', 'cpu', 'mem_peak', 'mem_net',
+           'thread', 'task', 'host', 'python')
+_HOST = socket.gethostname()
+_PYTHON = platform.python_version()
+_sinks: dict[str, tuple] = {}
+_sink_lock = threading.Lock()
+
+
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def _digest(args: tuple, kwargs: dict) -> str:
+    '''Digest of the arguments that is stable across runs: memory
+    addresses of default reprs ("<Foo object at 0x...>", "self" of
+    methods, functions) are dropped.'''
+    try:
+        text = repr((args, sorted(kwargs.items())))
+    except Exception:
+        return 'unrepr'
+    text = _ADDRESS.sub('', text)
+    return hashlib.sha1(text.encode('utf-8', 'replace')).hexdigest()[:12]
+
+
+def _sink(path: str | None) -> None:
+    with _sink_lock:
+        if path is None:
+            for f, _ in _sinks.values():
+                f.close()
+            _sinks.clear()
+            return
+        if path in _sinks:
+            return
+        f = open(path, 'a', newline='', encoding='utf-8')
+        writer = None
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(f, _FIELDS)
+            if not f.tell():
+                writer.writeheader()
+        _sinks[path] = f, writer
+
+
+def _write(rec: Record) -> None:
+    row = {'time': time.time(), 'name': rec.name, 'args': rec.args,
+           'wall': rec.wall, 'cpu': rec.cpu, 'mem_peak': rec.mem_peak,
+           'mem_net': rec.mem_net, 'thread': rec.thread, 'task': rec.task,
+           'host': _HOST, 'python': _PYTHON}
+    with _sink_lock:
+        for f, writer in _sinks.values():
+            if writer is None:
+                f.write(json.dumps(row) + '\n')
+            else:
+                writer.writerow(row)
+            f.flush()
+
+
+atexit.register(_sink, None)
+
+
+def _load(path: str) -> dict[tuple[str, str], list[float]]:
+    samples: dict[tuple[str, str], list[float]] = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            key = row['name'], row.get('args') or ''
+            samples.setdefault(key, []).append(float(row['wall']))
+    return samples
+
+
+def _mann_whitney(a: list[float], b: list[float]) -> float:
+    '''Two-sided p-value of the Mann-Whitney U test (normal approximation
+    with tie correction).'''
+    ranked = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    n1, n2, n = len(a), len(b), len(a) + len(b)
+    rank_a, ties, i = 0.0, 0.0, 0
+    while i < n:
+        j = i
+        while j < n and ranked[j][0] == ranked[i][0]:
+            j += 1
+        rank = (i + j + 1) / 2
+        rank_a += rank * sum(1 for k in range(i, j) if ranked[k][1] == 0)
+        ties += (j - i) ** 3 - (j - i)
+        i = j
+    u = rank_a - n1 * (n1 + 1) / 2
+    sigma = (n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))) ** 0.5
+    if not sigma:
+        return 1.0
+    z = (u - n1 * n2 / 2) / sigma
+    return 2 * (1 - statistics.NormalDist().cdf(abs(z)))
+
+
+def _compare(base: str, new: str, threshold: float = 0.05,
+             alpha: float = 0.05, min_samples: int = 5) -> list[dict]:
+    '''Compare wall times of two result files, function by function (and
+    arguments digest). A function is flagged as slower when its median
+    grew by more than "threshold" and the Mann-Whitney U test gives
+    p < alpha. Digest groups with fewer than "min_samples" calls on
+    either side are pooled per function (args "*"); what is still too
+    small gets the verdict "insufficient". Returns one dict per compared
+    group.'''
+    old_s, new_s = _load(base), _load(new)
+    for key in list(old_s.keys() | new_s.keys()):
+        if min(len(old_s.get(key, ())), len(new_s.get(key, ()))) < min_samples:
+            for samples in (old_s, new_s):
+                if key in samples:
+                    samples.setdefault((key[0], '*'), []).extend(
+                        samples.pop(key))
+    results = []
+    for key in sorted(old_s.keys() & new_s.keys()):
+        a, b = old_s[key], new_s[key]
+        med_a, med_b = statistics.median(a), statistics.median(b)
+        change = med_b / med_a - 1 if med_a else 0.0
+        p = (_mann_whitney(a, b)
+             if min(len(a), len(b)) >= min_samples else None)
+        if p is None:
+            verdict = 'insufficient'
+        elif p >= alpha or abs(change) <= threshold:
+            verdict = 'same'
+        else:
+            verdict = 'slower' if change > 0 else 'faster'
+        results.append({'name': key[0], 'args': key[1], 'n_base': len(a),
+                        'n_new': len(b), 'median_base': med_a,
+                        'median_new': med_b, 'change': change, 'p': p,
+                        'verdict': verdict})
+    colors = {'slower': '\033[1;31m', 'faster': '\033[32m', 'same': '',
+              'insufficient': '\033[33m'}
+    print(f'\n\033[1m\033[7m\033[36m compare \033[0m {base} -> {new}\n')
+    if not results:
+        print('\033[33mWarning: the files have no functions in common, '
+              'nothing was compared.\033[0m')
+    for r in results:
+        p = '   n/a' if r['p'] is None else f'{r["p"]:.4f}'
+        print(f'{colors[r["verdict"]]}{r["name"]:24} {r["args"]:12} '
+              f'{r["median_base"]:.6f} s -> {r["median_new"]:.6f} s '
+              f'{r["change"]:+8.1%}  p={p}  {r["verdict"]}\033[0m')
+    if any(r['verdict'] == 'insufficient' for r in results):
+        print(f'\033[33mWarning: fewer than {min_samples} calls per side, '
+              f'these rows were not tested.\033[0m')
+    return results
+
+
+def halt(fnc=None, *, memory=False, sample=1.0):
 
     '''"halt" is intended to measure the running time of other functions
 by specifying its arguments and name in the arguments of the "halt"
@@ -12,18 +690,47 @@ function methods, or by using "halt" as a decorator. In addition, when
 using "halt" as a function with arguments, it is possible to output the
 values ​​of the parameters and arguments of the target function.
 
-==========
-DO NOT USE "halt" both as usual function and as decorator in the same
-code,this will lead to infinite recursion
-==========
-
 Using as function:
     halt.method([*args,] fnc=some_target_func [, **kwargs])
 
+Using as decorator:
+    @halt
+    @halt(memory=True, sample=0.1)
+
 Methods defined here:
     time - returns running time of target function
     params - returns complete information about all parameters
              and arguments of a target function
+    last - returns the Record of the last measurement made in the
+           current thread / asyncio task (or None)
+    section - context manager timing a block inside a function:
+              with halt.section("parse"): ...
+    tree - returns the call tree of decorated functions and sections
+           (calls, inclusive and exclusive time) as indented text
+    collapsed - returns the same tree as collapsed stacks
+                ("main;parse;tokenize 1234", exclusive microseconds) for
+                flamegraph tools; collapsed("out.folded") also saves it
+    reset - clears the call tree and records
+    sample - halt.sample([*args,] fnc=f [, interval_ms=5, top=10,
+             max_overhead=0.02] [, **kwargs]) - times the call and
+             samples its stack on a timer, then prints the hottest lines
+             and functions; sampling overhead is bounded and reported
+    bench - halt.bench({"a": impl_a, "b": impl_b}, inputs=[...]) - runs
+            competing implementations in isolated, CPU-pinned worker
+            processes with interleaved rounds and prints a ranked table
+            with speedups and confidence intervals
+    sink - halt.sink("runs.jsonl") / halt.sink("runs.csv") appends every
+           measurement (name, arguments digest, timings, host, Python
+           version) to the file; halt.sink(None) closes all sinks
+    compare - compare(base_file, new_file) prints and returns per-function
+              median changes and flags statistically significant slowdowns;
+              also available from the shell:
+              python3 halt.py compare base.jsonl new.jsonl
+              (exit code 1 if anything got slower, 2 if the files have
+              no function in common or too few calls to test)
+
+Attributes:
+    records - deque of the latest Records from all threads and tasks
 
 As a return value, "halt" produces the result of calling the target
 function, which allows you to use it in any intermediate section of the
@@ -32,39 +739,86 @@ code:
     print(halt(<...>))
     a = list(halt(<...>))
     etc.
+
+"async def" targets are supported both ways: the decorated function
+stays a coroutine function, and halt.time(fnc=coro_fnc) returns an
+awaitable. Wall time then includes awaits, while cpu time counts only
+the steps executed by the coroutine itself.
+
+Every call keeps its own state, so "halt" can be used from several
+threads and tasks at once, and both as decorator and as function in the
+same code.
+
+Memory (decorator and halt.time options; "fnc", "memory" and "sample"
+keywords are consumed by halt and not passed to the target - a target
+that has parameters with these names gets them through
+target_kwargs={"memory": 5}, which is passed on unchanged; the same
+holds for "interval_ms", "top" and "max_overhead" of halt.sample):
+    memory=True  - also record peak and net memory allocated during the
+                   call (via tracemalloc) and the 3 source lines that
+                   allocated the most of what is still held at return
+    memory=N     - the same with N top lines (0 = totals only, faster)
+    sample=0.1   - trace only ~10% of calls, the others are timed only;
+                   tracing slows allocation-heavy code down several times
+tracemalloc is process-wide: it is started for traced calls only (unless
+it was already running), and allocations made by other threads during a
+traced call are counted too.
 '''
 
-    def f_0(*args, **kwargs):
-        if 'fnc' in kwargs:
-            nonlocal fnc
-            fnc = kwargs['fnc']
-            del kwargs['fnc']
-        res = fnc(*args, **kwargs)
-        params = inspect.getfullargspec(fnc),\
-            inspect.getcallargs(fnc, *args, **kwargs)
-        print('\n\033[1m\033[7m\033[36m', fnc.__name__,
-              '\033[0m', '\n', params, '\n')
-        return res
-
-    def f_1(*args, **kwargs):
-        if 'fnc' in kwargs:
-            nonlocal fnc
-            fnc = kwargs['fnc']
-            del kwargs['fnc']
-        startt = timeit.default_timer()
-        res = fnc(*args, **kwargs)
-        timee = timeit.default_timer() - startt
-        print('\n\033[1m\033[7m\033[32m',
-              fnc.__name__, '\033[0m', 'time: ',)
-        hourr = int(timee // 3600)
-        minutee = int(timee % 3600 // 60)
-        secondd = timee % 60
-        print(f'{hourr:02d} h {minutee:02d} min {secondd:.8f} s\n')
-        return res
-    halt.params = f_0
-    halt.time = f_1
-    if fnc:
-        return halt.time
-
-
-halt()
+    if fnc is None:
+        return functools.partial(halt, memory=memory, sample=sample)
+    if inspect.iscoroutinefunction(fnc):
+        @functools.wraps(fnc)
+        async def timed(*args, **kwargs):
+            return await _acall(fnc, args, kwargs, _mem_plan(memory, sample))
+    else:
+        @functools.wraps(fnc)
+        def timed(*args, **kwargs):
+            return _call(fnc, args, kwargs, _mem_plan(memory, sample))
+    return timed
+
+
+halt.params = _params
+halt.time = _time
+halt.last = _last.get
+halt.records = deque(maxlen=1000)
+halt.section = _Section
+halt.tree = _render
+halt.collapsed = _collapsed
+halt.reset = _reset
+halt.sink = _sink
+halt.sample = _sample
+halt.bench = _bench
+halt.compare = _compare
+
+
+def main():
+    parser = argparse.ArgumentParser(description="halt measurement tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmp = sub.add_parser(
+        "compare", help="Compare two result files (JSON Lines or CSV)")
+    cmp.add_argument("base", help="Results of the reference run")
+    cmp.add_argument("new", help="Results of the run under test")
+    cmp.add_argument("--threshold", type=float, default=0.05,
+                     help="Minimal relative change of the median to flag "
+                          "(default: 0.05 = 5%%)")
+    cmp.add_argument("--alpha", type=float, default=0.05,
+                     help="Significance level (default: 0.05)")
+    cmp.add_argument("--min-samples", type=int, default=5,
+                     help="Minimal number of samples per side (default: 5)")
+    args = parser.parse_args()
+
+    for path in (args.base, args.new):
+        if not os.path.isfile(path):
+            print(f"Error: File '{path}' not found.")
+            sys.exit(2)
+    results = _compare(args.base, args.new, args.threshold, args.alpha,
+                       args.min_samples)
+    verdicts = {r['verdict'] for r in results}
+    if 'slower' in verdicts:
+        sys.exit(1)
+    sys.exit(2 if not results or 'insufficient' in verdicts else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,14 @@ Options:
   -o FILE, --output FILE
       Output filename (default: "tree.txt")
 
+  --git
+      Build the tree from the git index (git ls-files) instead of the
+      filesystem: only tracked files are listed, ignored build output is
+      never visited
+
+  --untracked
+      With --git: also list untracked files that are not ignored
+
 Examples:
 
   python3 make_tree.py
@@ -37,6 +45,9 @@ Examples:
   python3 make_tree.py -i
       Run interactive mode to select folder and output file
 
+  python3 make_tree.py --git --untracked ~/src/project
+      Tree of the files git knows about (plus untracked, not ignored ones)
+
 Note:
   In silent mode (-s), specifying an output file (-o) is mandatory;
   otherwise the script will exit with an error.
@@ -81,6 +92,60 @@ def tree(
     return lines
 
 
+def git_tree(
+         dir_path: str,
+         prefix: str = "",
+         show_hidden: bool = False,
+         ignore_names: set[str] = None,
+         untracked: bool = False
+         ) -> list[str]:
+    """
+    Same output as tree(), but built from the git index in one streamed
+    read of "git ls-files -z" - the working tree directories are not listed.
+    """
+    if ignore_names is None:
+        ignore_names = set()
+    cmd = ["git", "-C", dir_path, "ls-files", "-z", "--cached"]
+    if untracked:
+        cmd += ["--others", "--exclude-standard"]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE)
+    except OSError as e:
+        raise RuntimeError(f"cannot run git: {e}") from e
+
+    root: dict = {}
+    rest = b""
+    for chunk in iter(lambda: proc.stdout.read(1 << 16), b""):
+        *paths, rest = (rest + chunk).split(b"\0")
+        for path in paths:
+            parts = os.fsdecode(path).split("/")
+            if any((not show_hidden and p.startswith(".")) or p in ignore_names
+                   for p in parts):
+                continue
+            node = root
+            for part in parts[:-1]:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = {}
+                node = child
+            node.setdefault(parts[-1], None)
+    if proc.wait() != 0:
+        raise RuntimeError(proc.stderr.read().decode(errors="replace").strip())
+
+    def render(node: dict, prefix: str) -> list[str]:
+        lines = []
+        entries = sorted(node)
+        for i, entry in enumerate(entries):
+            last = i == len(entries) - 1
+            lines.append(prefix + ("└── " if last else "├── ") + entry)
+            if isinstance(node[entry], dict):
+                lines.extend(render(node[entry], prefix + ("    " if last else "│   ")))
+        return lines
+
+    return render(root, prefix)
+
+
 def compare_trees(lines_old: list[str], lines_new: list[str]):
     for line in difflib.ndiff(lines_old, lines_new):
         if line.startswith("+ "):
@@ -228,6 +293,10 @@ def main():
     )
     parser.add_argument("--show-hidden", action="store_true",
                         help="Include hidden files and directories")
+    parser.add_argument("--git", action="store_true",
+                        help="Build the tree from the git index (tracked files only)")
+    parser.add_argument("--untracked", action="store_true",
+                        help="With --git: also list untracked, not ignored files")
     parser.add_argument("folder", nargs="?", default=os.getcwd(),
                         help="Root folder to build tree from (default: current directory)")
     parser.add_argument(
@@ -249,6 +318,8 @@ def main():
         args = parser.parse_args(["--interactive"])
     else:
         args = parser.parse_args()
+    if args.untracked and not args.git:
+        parser.error("--untracked requires --git")
 
     if args.compare:
         files = args.compare
@@ -260,7 +331,16 @@ def main():
             with open(filepath, encoding="utf-8") as f:
                 lines_saved = [line.rstrip("\n") for line in f.readlines()]
             root_name = os.path.basename(os.getcwd()) or "."
-            lines_current = [root_name + "/"] + tree(os.getcwd(), show_hidden=args.show_hidden)
+            if args.git:
+                try:
+                    current = git_tree(os.getcwd(), show_hidden=args.show_hidden,
+                                       untracked=args.untracked)
+                except RuntimeError as e:
+                    print(f"Error: {e}")
+                    return
+            else:
+                current = tree(os.getcwd(), show_hidden=args.show_hidden)
+            lines_current = [root_name + "/"] + current
             compare_trees(lines_saved, lines_current)
 
         elif len(files) == 2:
@@ -308,7 +388,15 @@ def main():
             ignore_names = set()
     else:
         ignore_names = prompt_ignore_list(folder)
-    lines = tree(folder, show_hidden=show_hidden, ignore_names=ignore_names)
+    if args.git:
+        try:
+            lines = git_tree(folder, show_hidden=show_hidden,
+                             ignore_names=ignore_names, untracked=args.untracked)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+    else:
+        lines = tree(folder, show_hidden=show_hidden, ignore_names=ignore_names)
 
     if not silent:
         print(root_name + os.sep)
@@ -2,12 +2,41 @@ import subprocess
 import os
 import sys
 import inspect
+import json
+import shlex
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 space = os.getcwd()
 
 dir_flag = False
 
+git_log = []          # every git call of the session, see run_git()
+last_action = None    # breakdown of the last menu action that ran git
+show_timing = False   # timing footer under the main menu
+user_wait = 0.0       # seconds spent waiting for the user (input, editor)
+_builtin_input = input
+
+
+def input(prompt=''):
+    """
+    input() that adds the time the user takes to user_wait, so that it is
+    not reported as time spent by the tool.
+    """
+    global user_wait
+    t0 = time.perf_counter()
+    try:
+        return _builtin_input(prompt)
+    finally:
+        user_wait += time.perf_counter() - t0
+
+
+def edit(path):
+    global user_wait
+    t0 = time.perf_counter()
+    os.system(f"${{EDITOR:-nano}} {shlex.quote(path)}")
+    user_wait += time.perf_counter() - t0
+
 def get_script_dir(follow_symlinks=True):
     if getattr(sys, 'frozen', False): # py2exe, PyInstaller, cx_Freeze
         path = os.path.abspath(sys.executable)
@@ -18,6 +47,138 @@ def get_script_dir(follow_symlinks=True):
     return os.path.dirname(path)
 
 
+def run_git(*args, repo=None, capture=False, tty=False):
+    """
+    The one place git is run from: no shell in between, and every call is
+    recorded in git_log (command, folder, wall time, exit code, output
+    bytes, index.lock contention).
+    capture=True - output is returned in .stdout/.stderr (text);
+    tty=True     - git keeps the terminal (pager, colors), bytes unknown;
+    otherwise    - stdout+stderr are passed through to the terminal and
+                   counted on the way.
+    """
+    cmd = ['git'] + (['-C', repo] if repo else []) + [str(a) for a in args]
+    started = time.time()
+    t0 = time.perf_counter()
+    if capture:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE)
+        output = proc.stdout + proc.stderr
+        proc.stdout = proc.stdout.decode(errors='replace')
+        proc.stderr = proc.stderr.decode(errors='replace')
+    elif tty:
+        proc = subprocess.run(cmd)
+        output = None
+    else:
+        sys.stdout.flush()
+        chunks = []
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT) as pipe:
+            for chunk in iter(lambda: pipe.stdout.read1(65536), b''):
+                chunks.append(chunk)
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+        output = b''.join(chunks)
+        proc = subprocess.CompletedProcess(cmd, pipe.returncode)
+    git_log.append({
+        'cmd': shlex.join(cmd),
+        'cwd': os.path.abspath(repo or '.'),
+        'start': started,
+        'wall': time.perf_counter() - t0,
+        'rc': proc.returncode,
+        'bytes': None if output is None else len(output),
+        'lock': output is not None and b'index.lock' in output})
+    return proc
+
+
+def timed_action(name, fnc):
+    """
+    Runs a menu action; if it called git, keeps its breakdown for the footer.
+    'wall' is the action's own time: waiting for the user is in 'wait'.
+    """
+    global last_action
+    start = len(git_log)
+    wait0 = user_wait
+    t0 = time.perf_counter()
+    try:
+        fnc()
+    finally:
+        if len(git_log) > start:
+            wait = user_wait - wait0
+            last_action = {'action': name,
+                           'wall': time.perf_counter() - t0 - wait,
+                           'wait': wait,
+                           'calls': git_log[start:]}
+
+
+def timing_footer(max_calls=8):
+    if not last_action:
+        return '\n\033[2mtiming: no git calls yet\033[0m'
+    calls = last_action['calls']
+    git_wall = sum(c['wall'] for c in calls)
+    lines = [f"\n\033[36mlast: {last_action['action']}  "
+             f"{last_action['wall']:.3f} s\033[0m  (git {git_wall:.3f} s "
+             f"in {len(calls)} call(s), "
+             f"{max(last_action['wall'] - git_wall, 0):.3f} s outside git; "
+             f"{last_action['wait']:.1f} s waiting for input not counted)"]
+    for c in calls[-max_calls:]:
+        size = '     tty' if c['bytes'] is None else f"{c['bytes']:6} B"
+        color = '\033[31m' if c['rc'] else ''
+        lock = '  \033[33mindex.lock\033[0m' if c['lock'] else ''
+        lines.append(f"  {color}{c['wall']:7.3f} s  rc {c['rc']:<3} "
+                     f"{size}  {c['cmd']}\033[0m{lock}")
+    if len(calls) > max_calls:
+        lines.insert(1, f"  ... {len(calls) - max_calls} earlier call(s)")
+    return '\n'.join(lines)
+
+
+def toggle_timing():
+    global show_timing
+    show_timing = not show_timing
+
+
+def dump_git_log():
+    """
+    Saves the session's git calls plus per-command totals to a JSON file.
+    """
+    name = input('\nFile name (<Enter> = micro_git_log.json, "q" = back): '
+                 ).strip()
+    if name == 'q':
+        return
+    name = os.path.expanduser(name or 'micro_git_log.json')
+    totals = {}
+    for c in git_log:
+        words = shlex.split(c['cmd'])[1:]
+        while words[:1] == ['-C']:
+            words = words[2:]
+        t = totals.setdefault(words[0] if words else '', {
+            'calls': 0, 'wall': 0.0, 'max': 0.0, 'bytes': 0, 'failed': 0})
+        t['calls'] += 1
+        t['wall'] += c['wall']
+        t['max'] = max(t['max'], c['wall'])
+        t['bytes'] += c['bytes'] or 0
+        t['failed'] += bool(c['rc'])
+    try:
+        with open(name, 'w', encoding='utf-8') as f:
+            json.dump({'calls': git_log, 'totals': totals}, f, indent=2)
+    except OSError as e:
+        input(f'\033[31m{e}\033[0m\nPress <Enter>')
+        return
+    print(f'\nSaved {len(git_log)} git call(s) to {os.path.abspath(name)}')
+    input('Press <Enter>')
+
+
+def pathspecs(text):
+    """
+    Names typed by the user, split like the shell would; text with
+    unbalanced quotes (don't.txt) is taken as one name.
+    """
+    try:
+        return shlex.split(text)
+    except ValueError:
+        return [text.strip()]
+
+
 def git_add():
     a = input('\nName to add or <Enter>\
      to \033[1;7;36madd all\033[0m, \"q\" = back\n')
@@ -25,9 +186,8 @@ def git_add():
         return
     if a == '':
         a = '.'
-    comm = ("git add " + a)
-    print(comm)
-    subprocess.call(comm, shell=True)
+    print("git add " + a)
+    run_git('add', *pathspecs(a))
     print('\no\'k\n')
     input('Press <Enter>')
 
@@ -35,17 +195,14 @@ def git_add():
 def git_commit():
     msg = input('\nMessage (<Enter> = empty, "q" = cancel)?\n')
     if msg != 'q':
-        subprocess.call(
-         'git commit -m ' + '\'' + msg + ' ' + time.asctime()
-         + '\'', shell=True)
+        run_git('commit', '-m', msg + ' ' + time.asctime())
         print('\no\'k\n')
         input('Press <Enter>')
 
 
 def git_batch_add():
     # Get list of changed files using git status --porcelain
-    proc = subprocess.Popen(['git', 'status', '--porcelain'], stdout=subprocess.PIPE, text=True)
-    output, _ = proc.communicate()
+    output = run_git('status', '--porcelain', capture=True).stdout
 
     if not output.strip():
         print("\nNo changes to add.")
@@ -92,13 +249,13 @@ def git_batch_add():
         print("\nAdding files:")
         for f in chosen_files:
             print(f"  {f}")
-            subprocess.call(['git', 'add', f])
+            run_git('add', f)
 
         break
 
 
 def git_show():
-    subprocess.call('git show', shell=True)
+    run_git('show', tty=True)
     print('\nEnter "q" to back\n')
     while True:
         if (input()) == 'q':
@@ -116,13 +273,13 @@ def git_restore_menu():
 
     if mode == 'w':
         print('\n\033[1;36mFiles from last commit:\033[0m\n')
-        subprocess.call("git diff --name-only HEAD", shell=True)
-        restore_cmd = "git restore"
+        run_git('diff', '--name-only', 'HEAD')
+        restore_cmd = ['restore']
         prompt_text = 'Name to restore or <Enter> to \033[1;7;36mrestore all\033[0m, "q" = back\n'
     else:
         print('\n\033[1;36mStaged files (added to index):\033[0m\n')
-        subprocess.call("git diff --cached --name-only", shell=True)
-        restore_cmd = "git restore --staged"
+        run_git('diff', '--cached', '--name-only')
+        restore_cmd = ['restore', '--staged']
         prompt_text = 'Name to unstage or <Enter> to \033[1;7;36munstage all\033[0m, "q" = back\n'
 
     while True:
@@ -133,9 +290,8 @@ def git_restore_menu():
             a = '.'
         break
 
-    comm = f"{restore_cmd} {a}"
-    print(comm)
-    subprocess.call(comm, shell=True)
+    print(' '.join(['git'] + restore_cmd + [a]))
+    run_git(*restore_cmd, *pathspecs(a))
     print("\no'k\n")
     input('Press <Enter>')
 
@@ -153,7 +309,7 @@ def git_batch_action():
         print("\n\033[32mDetected .gitchosen file.\033[0m")
         use = input("Use saved selection from .gitchosen? [y/N/v] ").strip().lower()
         if use == "v":
-            os.system("${EDITOR:-nano} .gitchosen")
+            edit(".gitchosen")
             use = input("Use updated .gitchosen now? [y/N] ").strip().lower()
         if use == "y":
             with open(".gitchosen", "r", encoding="utf-8") as f:
@@ -181,18 +337,17 @@ def git_batch_action():
         if action == 'add':
             print(f"\nAdding {len(chosen_list)} file(s) from .gitchosen...\n")
             for f in chosen_list:
-                subprocess.call(['git', 'add', f])
+                run_git('add', f)
             msg = input('\nEnter commit message (empty to cancel): ').strip()
             if msg:
-                subprocess.call(['git', 'commit', '-m', msg])
+                run_git('commit', '-m', msg)
                 print("\nCommit created.")
             else:
                 print("Commit cancelled.")
         else:
             print(f"\nRestoring {len(chosen_list)} file(s) from .gitchosen...\n")
-            restore_cmd = 'git restore'
             for f in chosen_list:
-                subprocess.call(restore_cmd.split() + [f])
+                run_git('restore', f)
             print("\nRestore completed.")
         input('Press <Enter>')
         return
@@ -200,9 +355,7 @@ def git_batch_action():
     # standard logic if .gitchosen is not used
     files = []
     if action == 'add':
-        proc = subprocess.Popen(['git', 'status', '--porcelain'],
-                                stdout=subprocess.PIPE, text=True)
-        output, _ = proc.communicate()
+        output = run_git('status', '--porcelain', capture=True).stdout
         if not output.strip():
             input(f'\nNo changes to {action}.\nPress Enter')
             return
@@ -220,15 +373,14 @@ def git_batch_action():
             print("Invalid choice, please enter 'w', 's', or 'q'.")
 
         if mode == 'w':
-            proc = subprocess.Popen(['git', 'diff', '--name-only', 'HEAD'],
-                                    stdout=subprocess.PIPE, text=True)
-            restore_cmd = 'git restore'
+            output = run_git('diff', '--name-only', 'HEAD',
+                             capture=True).stdout
+            restore_cmd = ['restore']
         else:
-            proc = subprocess.Popen(['git', 'diff', '--cached', '--name-only'],
-                                    stdout=subprocess.PIPE, text=True)
-            restore_cmd = 'git restore --staged'
+            output = run_git('diff', '--cached', '--name-only',
+                             capture=True).stdout
+            restore_cmd = ['restore', '--staged']
 
-        output, _ = proc.communicate()
         files = output.splitlines()
         if not files:
             input('\nNo files to restore.\nPress Enter')
@@ -271,16 +423,16 @@ def git_batch_action():
 
     if action == 'add':
         for f in chosen_files:
-            subprocess.call(['git', 'add', f])
+            run_git('add', f)
         msg = input('\nFile(s) added\nEnter commit message (empty to cancel): ').strip()
         if msg:
-            subprocess.call(['git', 'commit', '-m', msg])
+            run_git('commit', '-m', msg)
             print("\nCommit created.")
         else:
             print("Commit cancelled.")
     else:
         for f in chosen_files:
-            subprocess.call(restore_cmd.split() + [f])
+            run_git(*restore_cmd, f)
         print("\nRestore completed.")
 
     input('Press <Enter>')
@@ -333,7 +485,7 @@ def git_choose():
         if s.lower() == "q":
             break
         if s.lower() == "v":
-            os.system(f"${{EDITOR:-nano}} {chosen_path}")
+            edit(chosen_path)
             chosen = load_chosen()
             continue
 
@@ -359,7 +511,7 @@ def git_choose():
 
 
 def git_status():
-    subprocess.call('git status', shell=True)
+    run_git('status', tty=True)
     print('\nEnter "q" to back\n')
     while True:
         if (input()) == 'q':
@@ -381,11 +533,147 @@ def cd():
 
 
 def git_init():
-    subprocess.call('git init', shell=True)
+    run_git('init')
     print('\no\'k\n')
     input('Press <Enter>')
 
 
+def find_repos(root, max_depth=3):
+    """
+    Git work trees under root (root included), at most max_depth levels
+    deep; hidden folders are skipped, found repos are not descended into.
+    """
+    repos = []
+    root = os.path.abspath(root)
+    base_depth = root.rstrip(os.sep).count(os.sep)
+    for path, dirs, files in os.walk(root):
+        if '.git' in dirs or '.git' in files:
+            repos.append(path)
+            dirs[:] = []
+            continue
+        if path.count(os.sep) - base_depth >= max_depth:
+            dirs[:] = []
+            continue
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+    return sorted(repos)
+
+
+def repo_status(repo):
+    """
+    Status of one repo: branch, ahead/behind, changed files and changed
+    files listed in its .gitchosen.
+    """
+    proc = run_git('status', '--porcelain', '-b', repo=repo, capture=True)
+    info = {'repo': repo, 'branch': '?', 'track': '', 'changed': [],
+            'chosen': [], 'error': proc.stderr.strip() if proc.returncode
+            else ''}
+    lines = proc.stdout.splitlines()
+    if lines and lines[0].startswith('## '):
+        head = lines.pop(0)[3:]
+        if head.startswith('No commits yet on '):
+            head = head[len('No commits yet on '):]
+        info['branch'] = head.split('...')[0].split(' ')[0]
+        if '[' in head:
+            info['track'] = head[head.index('['):]
+    info['changed'] = [line[3:].strip() for line in lines if len(line) > 3]
+    chosen_path = os.path.join(repo, '.gitchosen')
+    if os.path.exists(chosen_path):
+        with open(chosen_path, 'r', encoding='utf-8') as f:
+            chosen = {x.strip() for x in f if x.strip()}
+        info['chosen'] = [f for f in info['changed'] if f in chosen]
+    return info
+
+
+def status_line(i, info, root):
+    name = os.path.relpath(info['repo'], root)
+    if info['error']:
+        return f"{i:3}: \033[31m{name:30} {info['error']}\033[0m"
+    changed = len(info['changed'])
+    chosen = len(info['chosen'])
+    color = '\033[33m' if chosen else ('\033[36m' if changed else '\033[32m')
+    return (f"{i:3}: {color}{name:30}\033[0m {info['branch']:16} "
+            f"{changed:4} changed  {chosen:3} chosen  {info['track']}")
+
+
+def multi_repo():
+    """
+    Dashboard of all git repos under a root folder: statuses are collected
+    in parallel and printed as they arrive; then add & commit can be run
+    over the selected repos in one go.
+    """
+    root = input('\nRoot folder (<Enter> = current, "q" = back): ').strip()
+    if root == 'q':
+        return
+    root = os.path.abspath(root or '.')
+    if not os.path.isdir(root):
+        input('\033[31mWrong name/address\033[0m\nPress <Enter>')
+        return
+    print(f'\nSearching repos under {root}...')
+    repos = find_repos(root)
+    if not repos:
+        input('\nNo git repos found.\nPress <Enter>')
+        return
+    print(f'Found {len(repos)} repo(s), collecting status:\n')
+
+    # one line per repo as soon as its status is known
+    infos = [None] * len(repos)
+    with ThreadPoolExecutor(max_workers=min(16, len(repos))) as pool:
+        futures = {pool.submit(repo_status, r): i
+                   for i, r in enumerate(repos)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                infos[i] = future.result()
+            except Exception as e:  # one bad checkout must not stop the rest
+                infos[i] = {'repo': repos[i], 'branch': '?', 'track': '',
+                            'changed': [], 'chosen': [],
+                            'error': f'{type(e).__name__}: {e}'}
+            print(status_line(i + 1, infos[i], root))
+
+    print('\nBatch add & commit: enter repo numbers separated by space,'
+          '\n"c" = all repos with changed .gitchosen files, "q" = back')
+    while True:
+        s = input('Selection: ').strip().lower()
+        if s == 'q' or not s:
+            return
+        if s == 'c':
+            chosen = [info for info in infos if info['chosen']]
+            break
+        try:
+            indices = [int(x) for x in s.split()]
+        except ValueError:
+            print("Invalid input, please enter numbers separated by spaces.")
+            continue
+        if any(i < 1 or i > len(infos) for i in indices):
+            print("Some numbers are out of range, please try again.")
+            continue
+        chosen = [infos[i - 1] for i in sorted(set(indices))]
+        break
+    chosen = [info for info in chosen if info['changed']]
+    if not chosen:
+        input('\nNothing to commit in the selected repos.\nPress <Enter>')
+        return
+
+    only_chosen = s == 'c' or input(
+        'Add (a)ll changes or only (g)itchosen files? [a/g] '
+        ).strip().lower() == 'g'
+    msg = input('\nEnter commit message (empty to cancel): ').strip()
+    if not msg:
+        print("Commit cancelled.")
+        input('Press <Enter>')
+        return
+
+    for info in chosen:
+        repo = info['repo']
+        files = info['chosen'] if only_chosen else ['.']
+        if not files:
+            continue
+        print(f"\n\033[1;36m{os.path.relpath(repo, root)}\033[0m")
+        run_git('add', '--', *files, repo=repo)
+        run_git('commit', '-m', msg, repo=repo)
+    input('\nPress <Enter>')
+
+
 def autostage_gitchosen():
     """
     Auto-check .gitchosen at program start and offer quick add/commit
@@ -394,9 +682,7 @@ def autostage_gitchosen():
     if not os.path.exists(".gitchosen"):
         return
 
-    proc = subprocess.Popen(["git", "status", "--porcelain"],
-                            stdout=subprocess.PIPE, text=True)
-    output, _ = proc.communicate()
+    output = run_git("status", "--porcelain", capture=True).stdout
     changed = {line[3:].strip() for line in output.splitlines() if len(line) > 3}
 
     if not changed:
@@ -423,12 +709,12 @@ def autostage_gitchosen():
         return
 
     for f in affected:
-        subprocess.call(["git", "add", f])
+        run_git("add", f)
     print(f"\nAdded {count} file(s).")
 
     msg = input("Enter commit message (empty = skip): ").strip()
     if msg:
-        subprocess.call(["git", "commit", "-m", msg])
+        run_git("commit", "-m", msg)
         print("\nCommit created.")
     else:
         print("Commit skipped.")
@@ -436,7 +722,7 @@ def autostage_gitchosen():
     input("Press <Enter> to continue...")
 
 
-autostage_gitchosen()
+timed_action('autostage .gitchosen', autostage_gitchosen)
 
 menu = {
  'cd': ['change dir (<Enter> then\
@@ -446,9 +732,12 @@ menu = {
  'c': ['commit', git_commit],
  'ch': ['choose files (.gitchosen)', git_choose],
  'i': ['init', git_init],
+ 'j': ['dump git call log to JSON', dump_git_log],
+ 'm': ['multi-repo dashboard', multi_repo],
  'r': ['restore/unsatge', git_restore_menu],
  's': ['show', git_show],
  'st': ['status', git_status],
+ 't': ['timing footer on/off', toggle_timing],
  'q': ['quit', exit]}
 
 
@@ -468,6 +757,8 @@ while True:
 
     for x in menu:
         print((x + ' >').rjust(4), menu[x][0])
+    if show_timing:
+        print(timing_footer())
     s = input('\nAction? ')
     if s in menu:
-        menu[s][1]()
+        timed_action(menu[s][0].split(' (')[0], menu[s][1])